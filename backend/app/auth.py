@@ -0,0 +1,75 @@
+import os
+import threading
+import time
+from collections import namedtuple
+
+from flask_jwt_extended import get_jwt
+from sqlalchemy import event
+
+from .models import User
+
+# ===================================
+# IDENTIDADE DO USUÁRIO (JWT)
+# ===================================
+# O login grava no token as informações que as rotas usam (is_admin,
+# username, name), assinadas junto com o JWT. Assim a autenticação e a
+# verificação de admin não consultam o banco a cada requisição.
+#
+# Tokens antigos, emitidos sem essas claims, caem no cache de identidades:
+# uma consulta por usuário a cada IDENTITY_CACHE_TTL segundos, invalidada
+# sempre que o usuário é alterado ou removido.
+
+Identity = namedtuple('Identity', ['id', 'username', 'name', 'is_admin'])
+
+IDENTITY_CLAIMS = ('username', 'name', 'is_admin')
+
+_lock = threading.Lock()
+_identities = {}
+
+
+def identity_claims(user):
+    return {'username': user.username, 'name': user.name, 'is_admin': bool(user.is_admin)}
+
+
+def identity_from_claims(jwt_data):
+    if not all(claim in jwt_data for claim in IDENTITY_CLAIMS):
+        return None
+    return Identity(int(jwt_data['sub']), jwt_data['username'], jwt_data['name'], jwt_data['is_admin'])
+
+
+def load_identity(user_id):
+    """Identidade do usuário pelo cache; consulta o banco só quando expirada."""
+    user_id = int(user_id)
+    now = time.monotonic()
+    with _lock:
+        entry = _identities.get(user_id)
+    if entry and entry[0] > now:
+        return entry[1]
+
+    user = User.query.get(user_id)
+    if not user:
+        return None
+    identity = Identity(user.id, user.username, user.name, bool(user.is_admin))
+    ttl = int(os.getenv('IDENTITY_CACHE_TTL', 30))
+    with _lock:
+        _identities[user_id] = (now + ttl, identity)
+    return identity
+
+
+def forget_identity(user_id):
+    with _lock:
+        _identities.pop(int(user_id), None)
+
+
+def current_identity(jwt_data=None):
+    """Identidade do token atual; None sem token (rotas com jwt_required(optional=True))."""
+    jwt_data = jwt_data if jwt_data is not None else get_jwt()
+    if 'sub' not in jwt_data:
+        return None
+    return identity_from_claims(jwt_data) or load_identity(jwt_data['sub'])
+
+
+@event.listens_for(User, 'after_update')
+@event.listens_for(User, 'after_delete')
+def _user_changed(mapper, connection, target):
+    forget_identity(target.id)
@@ -0,0 +1,47 @@
+from flask import current_app, g, request
+
+# ===================================
+# ORÇAMENTO DE CONSULTAS SQL POR ROTA
+# ===================================
+# Uso:
+#
+#     @bp.route('/favorites')
+#     @query_budget(2)
+#     def favorites(): ...
+#
+# A contagem vem do gancho de SQL de metrics.py (g.sql_statements). Quando
+# a rota passa do orçamento: em TESTING (ou QUERY_BUDGET_STRICT) a requisição
+# levanta QueryBudgetExceeded, o que derruba o teste; em modo debug só gera
+# um warning no log. Em produção nada é verificado.
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+def query_budget(max_queries):
+    def decorator(view):
+        view.query_budget = max_queries
+        return view
+    return decorator
+
+
+def _check_budget(response):
+    strict = current_app.testing or current_app.config.get('QUERY_BUDGET_STRICT')
+    if not (strict or current_app.debug):
+        return response
+
+    budget = getattr(current_app.view_functions.get(request.endpoint), 'query_budget', None)
+    used = g.get('sql_statements', 0)
+    if budget is None or used <= budget:
+        return response
+
+    message = f'{request.method} {request.path} ({request.endpoint}) executou {used} consultas SQL; orçamento: {budget}'
+    if strict:
+        raise QueryBudgetExceeded(message)
+    current_app.logger.warning(message)
+    return response
+
+
+def init_app(app):
+    app.after_request(_check_budget)
@@ -0,0 +1,206 @@
+import csv
+import io
+import json
+
+from sqlalchemy import bindparam, insert, select, update
+from sqlalchemy.exc import SQLAlchemyError
+
+from . import db
+from .models import Product
+
+# ===================================
+# IMPORTAÇÃO EM LOTE DE PRODUTOS
+# ===================================
+# O corpo é lido linha a linha direto do stream da requisição (NDJSON ou
+# CSV), sem carregar o arquivo inteiro. As linhas válidas são gravadas em
+# lotes de INSERTs multi-linha, cada lote na sua transação.
+# Linhas com "id" fazem upsert: um produto existente só tem alterados os
+# campos presentes na linha; os demais ficam como estão.
+
+BATCH_SIZE = 1000
+MAX_REPORTED_ERRORS = 1000
+
+PRODUCT_FIELDS = ('name', 'description', 'price', 'type', 'image_url', 'video_url', 'stock')
+MAX_LENGTHS = {'name': 100, 'type': 50, 'image_url': 200, 'video_url': 200}
+
+
+class RowError(ValueError):
+    pass
+
+
+def iter_rows(stream, content_type):
+    """Gera (número da linha, dicionário) a partir do corpo da requisição."""
+    text = io.TextIOWrapper(io.BufferedReader(stream), encoding='utf-8-sig', newline='')
+    if content_type == 'text/csv':
+        reader = csv.DictReader(text)
+        for row in reader:
+            yield reader.line_num, {k: v for k, v in row.items() if k is not None and v != ''}
+        return
+
+    for line_number, line in enumerate(text, start=1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError:
+            yield line_number, RowError('JSON inválido')
+            continue
+        yield line_number, row if isinstance(row, dict) else RowError('cada linha deve ser um objeto JSON')
+
+
+def validate_row(row):
+    """Converte e valida uma linha; devolve o dicionário pronto para o INSERT.
+
+    Linhas sem id levam todos os campos (os ausentes ficam nulos, estoque 0).
+    Linhas com id levam só os campos informados, para o upsert não apagar o resto.
+    """
+    if isinstance(row, RowError):
+        raise row
+
+    has_id = row.get('id') not in (None, '')
+    fields = [field for field in PRODUCT_FIELDS if field in row] if has_id else PRODUCT_FIELDS
+    product = {field: row.get(field) for field in fields}
+
+    if 'name' in product or not has_id:
+        name = product.get('name')
+        if not isinstance(name, str) or not name.strip():
+            raise RowError('name é obrigatório')
+        product['name'] = name.strip()
+    try:
+        if 'price' in product:
+            product['price'] = float(product['price']) if product['price'] not in (None, '') else None
+        if 'stock' in product:
+            product['stock'] = int(product['stock']) if product['stock'] not in (None, '') else 0
+    except (TypeError, ValueError):
+        raise RowError('price e stock devem ser numéricos')
+    if product.get('price') is not None and product['price'] < 0:
+        raise RowError('price não pode ser negativo')
+    if product.get('stock', 0) < 0:
+        raise RowError('stock não pode ser negativo')
+    for field, max_length in MAX_LENGTHS.items():
+        if product.get(field) is not None and len(str(product[field])) > max_length:
+            raise RowError(f'{field} deve ter no máximo {max_length} caracteres')
+
+    if has_id:
+        try:
+            product['id'] = int(row['id'])
+        except (TypeError, ValueError):
+            raise RowError('id deve ser um número inteiro')
+        if product['id'] < 1:
+            raise RowError('id deve ser positivo')
+    return product
+
+
+def _write(rows):
+    """Grava as linhas; devolve os ids informados que de fato foram inseridos ou alterados."""
+    # executemany de Core: o SQLAlchemy agrupa as linhas em INSERTs multi-linha
+    # ("insertmanyvalues") reaproveitando o statement compilado entre lotes
+    connection = db.session.connection()
+    table = Product.__table__
+    upsert_rows = [row for row in rows if 'id' in row]
+    existing = set()
+    if upsert_rows:
+        existing = set(connection.execute(
+            select(table.c.id).where(table.c.id.in_({row['id'] for row in upsert_rows}))).scalars())
+
+    written = set()
+    new_rows = [row for row in rows if row.get('id') not in existing]
+    if new_rows:
+        # Produtos novos (com ou sem id): campos ausentes ficam com o padrão da coluna.
+        # Linhas com e sem id ficam em grupos separados: o INSERT compilado segue as
+        # chaves da primeira linha do grupo e descartaria o id das demais.
+        for group in _group_by_fields(new_rows).values():
+            connection.execute(insert(table), group)
+        written.update(row['id'] for row in new_rows if 'id' in row)
+
+    # Produtos existentes: UPDATE só dos campos informados, um statement por combinação.
+    # Se outro processo inserir o mesmo id entre o SELECT e o INSERT, o lote
+    # falha e é regravado linha a linha, já como UPDATE.
+    for key, group in _group_by_fields([row for row in upsert_rows if row['id'] in existing]).items():
+        fields = [field for field in key if field != 'id']
+        if fields:
+            # Nova image_url: o srcset de um upload anterior deixa de valer
+            extra = {'image_srcset': None} if 'image_url' in fields else {}
+            connection.execute(update(table).where(table.c.id == bindparam('_id')),
+                               [{'_id': row['id'], **{field: row[field] for field in fields}, **extra} for row in group])
+            written.update(row['id'] for row in group)
+    return written
+
+
+def _group_by_fields(rows):
+    groups = {}
+    for row in rows:
+        groups.setdefault(tuple(field for field in ('id',) + PRODUCT_FIELDS if field in row), []).append(row)
+    return groups
+
+
+def write_batch(batch, report):
+    """Grava um lote em uma transação; se falhar, regrava linha a linha para achar as ruins."""
+    try:
+        written = _write([row for _, row in batch])
+        db.session.commit()
+        report.imported(batch, written)
+        return
+    except SQLAlchemyError:
+        db.session.rollback()
+
+    for line_number, row in batch:
+        try:
+            written = _write([row])
+            db.session.commit()
+            report.imported([(line_number, row)], written)
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            report.error(line_number, f'erro no banco: {e.orig if getattr(e, "orig", None) else e}')
+
+
+class ImportReport:
+    def __init__(self):
+        self.processed = 0
+        self.created = 0
+        self.upserted = 0
+        self.failed = 0
+        self.errors = []
+        self.upserted_ids = set()
+
+    def imported(self, batch, written_ids):
+        # upserted_ids guia a invalidação do cache e a reindexação: só ids gravados
+        self.upserted_ids.update(written_ids)
+        for _, row in batch:
+            if 'id' in row:
+                self.upserted += 1
+            else:
+                self.created += 1
+
+    def error(self, line_number, message):
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({'line': line_number, 'error': message})
+
+    def to_dict(self):
+        return {
+            'processed': self.processed,
+            'created': self.created,
+            'upserted': self.upserted,
+            'failed': self.failed,
+            'errors': self.errors,
+            'errors_truncated': self.failed > len(self.errors),
+        }
+
+
+def import_products(stream, content_type, batch_size=BATCH_SIZE):
+    report = ImportReport()
+    batch = []
+    for line_number, row in iter_rows(stream, content_type):
+        report.processed += 1
+        try:
+            batch.append((line_number, validate_row(row)))
+        except RowError as e:
+            report.error(line_number, str(e))
+            continue
+        if len(batch) >= batch_size:
+            write_batch(batch, report)
+            batch = []
+    if batch:
+        write_batch(batch, report)
+    return report
@@ -0,0 +1,247 @@
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from datetime import datetime, timezone
+from functools import wraps
+
+from flask import current_app, g, make_response, request
+
+from .compression import EncodedBody
+from .replica import read_primary
+
+# ===================================
+# VERSÕES DOS RECURSOS DO CATÁLOGO
+# ===================================
+# Cada recurso ("products", "tips", ...) tem um contador que as rotas admin
+# incrementam via mark_changed(). As leituras montam o ETag a partir desses
+# contadores, então um If-None-Match é respondido sem ir ao banco.
+#
+# Os contadores vivem na memória do processo. Para que vários workers não
+# respondam 304 indefinidamente com dados que outro worker alterou, o ETag
+# também carrega a janela de tempo atual (CATALOG_ETAG_WINDOW, em segundos),
+# e o Last-Modified acompanha o início dessa janela.
+
+_lock = threading.Lock()
+_boot_id = uuid.uuid4().hex[:8]
+_started_at = datetime.now(timezone.utc).replace(microsecond=0)
+_versions = {}
+_changed_at = {}
+
+
+def mark_changed(*resources):
+    """Registra que os recursos mudaram (chamar após o commit da escrita).
+
+    Além de incrementar as versões, remove do cache de respostas as entradas
+    marcadas com esses recursos.
+    """
+    now = datetime.now(timezone.utc).replace(microsecond=0)
+    with _lock:
+        for resource in resources:
+            version, _ = _versions.get(resource, (0, _started_at))
+            _versions[resource] = (version + 1, now)
+            _changed_at[resource] = time.monotonic()
+    response_cache.invalidate(resources)
+
+
+def resource_versions(resources):
+    return tuple(_versions.get(resource, (0,))[0] for resource in resources)
+
+
+def changed_within(resources, seconds):
+    """True se algum dos recursos mudou neste processo nos últimos segundos."""
+    limit = time.monotonic() - seconds
+    return any(_changed_at.get(resource, float('-inf')) > limit for resource in resources)
+
+
+def expand(resources, view_args):
+    """Preenche recursos parametrizados, ex.: 'reviews:{product_id}'.
+
+    Um recurso também pode ser uma função sem argumentos que devolve os
+    recursos da requisição atual (ex.: só depende de 'ratings' com include=rating).
+    """
+    expanded = []
+    for resource in resources:
+        if callable(resource):
+            expanded.extend(resource())
+        else:
+            expanded.append(resource.format(**view_args))
+    return tuple(expanded)
+
+
+def resource_stamp(resources):
+    """ETag forte e Last-Modified atuais para um conjunto de recursos.
+
+    O Last-Modified nunca é anterior ao início da janela atual: um worker que
+    não viu a escrita feita em outro deixa de responder 304 ao If-Modified-Since
+    quando a janela vira, como acontece com o ETag.
+    """
+    window = current_app.config.get('CATALOG_ETAG_WINDOW', 60)
+    bucket = int(time.time() // window) if window else 0
+    stamps = [_versions.get(resource, (0, _started_at)) for resource in resources]
+    versions = '.'.join(str(version) for version, _ in stamps)
+    last_modified = max(modified for _, modified in stamps)
+    if window:
+        last_modified = max(last_modified, datetime.fromtimestamp(bucket * window, timezone.utc))
+    return f'{_boot_id}-{bucket}-{versions}', last_modified
+
+
+def not_modified(etag, last_modified):
+    if request.if_none_match:
+        return request.if_none_match.contains_weak(etag)
+    if request.if_modified_since:
+        return last_modified <= request.if_modified_since
+    return False
+
+
+def conditional(*resources):
+    """Adiciona ETag/Last-Modified/Cache-Control e responde 304 antes de executar a rota."""
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            # O carimbo é lido antes da consulta: se o dado mudar no meio da
+            # requisição, o cliente só recebe um ETag antigo e revalida depois.
+            etag, last_modified = resource_stamp(expand(resources, kwargs))
+            # Quem acabou de escrever não recebe 304: o ETag de outro worker
+            # pode ser o mesmo de antes da escrita
+            if not read_primary() and not_modified(etag, last_modified):
+                response = current_app.response_class(status=304)
+            else:
+                response = make_response(view(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+            response.set_etag(etag)
+            response.last_modified = last_modified
+            response.cache_control.public = True
+            response.cache_control.no_cache = True
+            return response
+        return wrapper
+    return decorator
+
+
+# ===================================
+# CACHE DE RESPOSTAS (LRU + TTL)
+# ===================================
+
+class ResponseCache:
+    """Corpos JSON serializados das leituras públicas, por rota e query string,
+    junto com as versões já comprimidas (EncodedBody).
+
+    Cada entrada é marcada com os recursos de que depende; mark_changed()
+    remove só as entradas desses recursos.
+    """
+
+    def __init__(self, maxsize=1024, ttl=60):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._by_resource = {}
+        self.hits = self.misses = self.evictions = self.expirations = self.invalidations = 0
+
+    def init_app(self, app):
+        self.maxsize = app.config.setdefault('CATALOG_CACHE_SIZE', int(os.getenv('CATALOG_CACHE_SIZE', 1024)))
+        self.ttl = app.config.setdefault('CATALOG_CACHE_TTL', int(os.getenv('CATALOG_CACHE_TTL', 60)))
+        self.clear()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            if entry[0] <= time.monotonic():
+                self._remove(key)
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[2]
+
+    def set(self, key, value, resources):
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (time.monotonic() + self.ttl, resources, value)
+            for resource in resources:
+                self._by_resource.setdefault(resource, set()).add(key)
+            while len(self._entries) > self.maxsize:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def invalidate(self, resources):
+        with self._lock:
+            for resource in resources:
+                for key in self._by_resource.pop(resource, ()):
+                    if key in self._entries:
+                        self._remove(key)
+                        self.invalidations += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._by_resource.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+                'ttl': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': round(self.hits / lookups, 3) if lookups else None,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'invalidations': self.invalidations,
+            }
+
+    def _remove(self, key):
+        _, resources, _ = self._entries.pop(key)
+        for resource in resources:
+            keys = self._by_resource.get(resource)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._by_resource[resource]
+
+
+response_cache = ResponseCache()
+
+
+def cached(*resources):
+    """Guarda o corpo das respostas 200 da rota no cache de respostas.
+
+    Clientes que acabaram de escrever (replica.read_primary) leem direto do
+    banco principal, sem usar nem preencher o cache.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            if read_primary():
+                return view(*args, **kwargs)
+            tags = expand(resources, kwargs)
+            key = (request.path, tuple(sorted(request.args.items(multi=True))))
+            entry = response_cache.get(key)
+            if entry is not None:
+                return entry.response()
+
+            # Só guarda se nenhuma escrita invalidou os recursos durante a
+            # consulta, nem se a leitura veio da réplica logo depois de uma
+            # escrita (a réplica pode ainda não ter recebido o dado)
+            versions = resource_versions(tags)
+            response = make_response(view(*args, **kwargs))
+            lagging = g.get('use_replica') and changed_within(
+                tags, current_app.config.get('REPLICA_STICKY_SECONDS', 0))
+            if response.status_code == 200 and resource_versions(tags) == versions and not lagging:
+                entry = EncodedBody(response.get_data(), response.mimetype)
+                response_cache.set(key, entry, tags)
+                return entry.response()
+            return response
+        return wrapper
+    return decorator
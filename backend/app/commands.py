@@ -0,0 +1,54 @@
+import click
+from sqlalchemy import select, update
+
+from . import db
+from .models import Product, ProductImage, Review
+
+# ===================================
+# COMANDOS DE MANUTENÇÃO (flask <comando>)
+# ===================================
+
+def register_commands(app):
+    app.cli.add_command(repair_ratings)
+    app.cli.add_command(process_images)
+
+
+@click.command('repair-ratings')
+@click.option('--batch-size', default=5000, show_default=True,
+              help='Quantidade de produtos recalculados por transação.')
+def repair_ratings(batch_size):
+    """Recalcula rating_sum/rating_count de todos os produtos a partir de reviews."""
+    rating_sum = select(db.func.coalesce(db.func.sum(Review.rating), 0)).where(
+        Review.product_id == Product.id).scalar_subquery()
+    rating_count = select(db.func.count(Review.rating)).where(
+        Review.product_id == Product.id).scalar_subquery()
+
+    max_id = db.session.query(db.func.max(Product.id)).scalar() or 0
+    repaired = 0
+    # Faixas de id em transações curtas para não travar a tabela inteira
+    for start in range(0, max_id, batch_size):
+        result = db.session.execute(
+            update(Product)
+            .where(Product.id > start, Product.id <= start + batch_size)
+            .values(rating_sum=rating_sum, rating_count=rating_count)
+            .execution_options(synchronize_session=False)
+        )
+        db.session.commit()
+        repaired += result.rowcount
+    click.echo(f'✅ Agregados de notas recalculados para {repaired} produtos')
+
+
+@click.command('process-images')
+@click.option('--failed', is_flag=True, help='Inclui também as imagens que falharam.')
+def process_images(failed):
+    """Gera as variantes das imagens pendentes (ex.: o processo caiu antes do worker terminar)."""
+    from .media import process_image
+
+    statuses = ['pending', 'failed'] if failed else ['pending']
+    image_ids = db.session.scalars(
+        select(ProductImage.id).where(ProductImage.status.in_(statuses)).order_by(ProductImage.id)).all()
+    for image_id in image_ids:
+        process_image(image_id)
+    ready = db.session.query(ProductImage).filter(
+        ProductImage.id.in_(image_ids), ProductImage.status == 'ready').count() if image_ids else 0
+    click.echo(f'✅ Variantes geradas para {ready} de {len(image_ids)} imagens')
@@ -0,0 +1,122 @@
+import os
+import zlib
+
+from flask import current_app, request
+
+try:
+    import brotli
+except ImportError:  # opcional: sem brotli só há gzip
+    brotli = None
+
+# ===================================
+# COMPRESSÃO DAS RESPOSTAS (gzip / brotli)
+# ===================================
+# Respostas de texto acima de COMPRESSION_MIN_SIZE bytes são comprimidas
+# com o melhor formato aceito pelo cliente (Accept-Encoding). As entradas
+# do cache de respostas guardam também as versões comprimidas, então uma
+# leitura do catálogo é comprimida uma vez por versão dos dados, e não a
+# cada requisição.
+
+COMPRESSIBLE_TYPES = ('application/json', 'application/x-ndjson', 'application/javascript', 'image/svg+xml')
+
+
+def is_compressible(mimetype):
+    return mimetype.startswith('text/') or mimetype in COMPRESSIBLE_TYPES
+
+
+def negotiate():
+    """Melhor codificação aceita pelo cliente ('br', 'gzip') ou None."""
+    accept = request.accept_encodings
+    options = [(accept['br'], 'br')] if brotli is not None else []
+    options.append((accept['gzip'], 'gzip'))
+    quality, encoding = max(options, key=lambda option: option[0])
+    return encoding if quality > 0 else None
+
+
+def compress(data, encoding):
+    config = current_app.config
+    if encoding == 'br':
+        return brotli.compress(data, quality=config['COMPRESSION_BROTLI_QUALITY'])
+    compressor = zlib.compressobj(config['COMPRESSION_GZIP_LEVEL'], zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    return compressor.compress(data) + compressor.flush()
+
+
+def compress_stream(chunks, encoding):
+    """Comprime um corpo gerado aos poucos, bloco a bloco."""
+    config = current_app.config
+    if encoding == 'br':
+        compressor = brotli.Compressor(quality=config['COMPRESSION_BROTLI_QUALITY'])
+        compress_chunk, finish = compressor.process, compressor.finish
+    else:
+        compressor = zlib.compressobj(config['COMPRESSION_GZIP_LEVEL'], zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+        compress_chunk, finish = compressor.compress, compressor.flush
+    for chunk in chunks:
+        data = compress_chunk(chunk)
+        if data:
+            yield data
+    yield finish()
+
+
+class EncodedBody:
+    """Corpo de uma resposta e suas versões comprimidas, criadas na primeira vez que são pedidas."""
+
+    __slots__ = ('body', 'mimetype', 'variants')
+
+    def __init__(self, body, mimetype):
+        self.body = body
+        self.mimetype = mimetype
+        self.variants = {}
+
+    def response(self):
+        eligible = len(self.body) >= current_app.config['COMPRESSION_MIN_SIZE'] and is_compressible(self.mimetype)
+        encoding = negotiate() if eligible else None
+
+        if encoding is None:
+            response = current_app.response_class(self.body, status=200, mimetype=self.mimetype)
+        else:
+            data = self.variants.get(encoding)
+            if data is None:
+                # Duas threads podem comprimir ao mesmo tempo; o resultado é o mesmo
+                data = self.variants[encoding] = compress(self.body, encoding)
+            response = current_app.response_class(data, status=200, mimetype=self.mimetype)
+            response.content_encoding = encoding
+        if eligible:
+            response.vary.add('Accept-Encoding')
+        return response
+
+
+def _compress_response(response):
+    if response.content_encoding:
+        # Já comprimida (cache de respostas ou stream): o ETag passa a ser
+        # fraco, já que os bytes não são os da representação original
+        if response.content_encoding in ('gzip', 'br'):
+            _weaken_etag(response)
+        return response
+    if (response.status_code != 200 or response.direct_passthrough or response.is_streamed
+            or not is_compressible(response.mimetype or '')):
+        return response
+
+    data = response.get_data()
+    if len(data) < current_app.config['COMPRESSION_MIN_SIZE']:
+        return response
+    response.vary.add('Accept-Encoding')
+    encoding = negotiate()
+    if encoding is None:
+        return response
+    response.set_data(compress(data, encoding))
+    response.content_encoding = encoding
+    _weaken_etag(response)
+    return response
+
+
+def _weaken_etag(response):
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(etag, weak=True)
+
+
+def init_app(app):
+    app.config.setdefault('COMPRESSION_MIN_SIZE', int(os.getenv('COMPRESSION_MIN_SIZE', 1024)))
+    app.config.setdefault('COMPRESSION_GZIP_LEVEL', int(os.getenv('COMPRESSION_GZIP_LEVEL', 6)))
+    app.config.setdefault('COMPRESSION_BROTLI_QUALITY', int(os.getenv('COMPRESSION_BROTLI_QUALITY', 5)))
+    app.after_request(_compress_response)
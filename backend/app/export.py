@@ -0,0 +1,66 @@
+import csv
+import io
+import json
+
+from sqlalchemy import select
+
+from . import db, serializers
+from .compression import compress_stream
+from .models import Product
+
+# ===================================
+# EXPORTAÇÃO DO CATÁLOGO EM STREAMING
+# ===================================
+# As linhas vêm do banco em blocos (yield_per usa cursor do lado do
+# servidor quando o driver suporta) e são convertidas e enviadas à medida
+# que chegam. A memória usada fica constante, qualquer que seja o tamanho
+# da tabela.
+
+EXPORT_FIELDS = serializers.products.fields
+EXPORT_FORMATS = {'ndjson': 'application/x-ndjson', 'csv': 'text/csv'}
+FETCH_SIZE = 1000
+CHUNK_SIZE = 64 * 1024
+
+
+def iter_products():
+    result = db.session.execute(
+        select(*serializers.products.columns).order_by(Product.id).execution_options(yield_per=FETCH_SIZE))
+    for row in result:
+        yield row
+
+
+def iter_ndjson(rows):
+    for row in rows:
+        yield json.dumps(dict(zip(EXPORT_FIELDS, row)), ensure_ascii=False) + '\n'
+
+
+def iter_csv(rows):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_FIELDS)
+    for row in rows:
+        writer.writerow(row)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    yield buffer.getvalue()
+
+
+def chunked(lines, size=CHUNK_SIZE):
+    """Junta as linhas em blocos de ~size bytes (menos escritas no socket)."""
+    parts, length = [], 0
+    for line in lines:
+        data = line.encode('utf-8')
+        parts.append(data)
+        length += len(data)
+        if length >= size:
+            yield b''.join(parts)
+            parts, length = [], 0
+    if parts:
+        yield b''.join(parts)
+
+
+def export_products(fmt, encoding=None):
+    lines = iter_ndjson(iter_products()) if fmt == 'ndjson' else iter_csv(iter_products())
+    chunks = chunked(lines)
+    return compress_stream(chunks, encoding) if encoding else chunks
@@ -0,0 +1,127 @@
+import hmac
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError
+from concurrent.futures.process import BrokenProcessPool
+
+import bcrypt as _bcrypt
+
+# ===================================
+# HASH DE SENHAS FORA DA THREAD DA REQUISIÇÃO
+# ===================================
+# O bcrypt é caro de propósito. Rodar na thread da requisição faz uma rajada
+# de logins ocupar a CPU do worker e atrasar as rotas do catálogo. Aqui o
+# trabalho vai para um pool de processos limitado; quando a fila enche, a
+# rota recebe HashingBusy e responde 503 na hora em vez de enfileirar.
+
+# Limite do bcrypt: bytes além de 72 são ignorados (mesmo comportamento dos
+# hashes gerados antes pelo Flask-Bcrypt)
+MAX_PASSWORD_BYTES = 72
+
+
+class HashingBusy(Exception):
+    pass
+
+
+def _hash_password(password, rounds):
+    return _bcrypt.hashpw(password[:MAX_PASSWORD_BYTES], _bcrypt.gensalt(rounds)).decode('utf-8')
+
+
+def _check_password(pw_hash, password):
+    try:
+        return hmac.compare_digest(_bcrypt.hashpw(password[:MAX_PASSWORD_BYTES], pw_hash), pw_hash)
+    except ValueError:
+        # Hash corrompido ou em formato desconhecido
+        return False
+
+
+class PasswordHasher:
+    def __init__(self):
+        self.rounds = 12
+        self.workers = 1
+        self.queue_size = 4
+        self.timeout = 10
+        self._executor = None
+        self._executor_pid = None
+        self._slots = threading.BoundedSemaphore(self.queue_size)
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        self.rounds = app.config.setdefault('BCRYPT_LOG_ROUNDS', int(os.getenv('BCRYPT_LOG_ROUNDS', 12)))
+        # 0 workers = hash na própria thread (útil em desenvolvimento e testes)
+        self.workers = app.config.setdefault(
+            'PASSWORD_HASH_WORKERS', int(os.getenv('PASSWORD_HASH_WORKERS', max(1, (os.cpu_count() or 2) // 2))))
+        self.queue_size = app.config.setdefault(
+            'PASSWORD_HASH_QUEUE', int(os.getenv('PASSWORD_HASH_QUEUE', max(1, self.workers) * 4)))
+        self.timeout = app.config.setdefault('PASSWORD_HASH_TIMEOUT', float(os.getenv('PASSWORD_HASH_TIMEOUT', 10)))
+        self._slots = threading.BoundedSemaphore(self.queue_size)
+
+    def generate_password_hash(self, password):
+        return self._run(_hash_password, password.encode('utf-8'), self.rounds)
+
+    def check_password_hash(self, pw_hash, password):
+        return self._run(_check_password, pw_hash.encode('utf-8'), password.encode('utf-8'))
+
+    def needs_rehash(self, pw_hash):
+        """True quando o hash foi gerado com um custo diferente do configurado."""
+        try:
+            return int(pw_hash.split('$')[2]) != self.rounds
+        except (IndexError, ValueError):
+            return False
+
+    def _run(self, fn, *args):
+        if not self.workers:
+            slots = self._acquire_slot()
+            try:
+                return fn(*args)
+            finally:
+                slots.release()
+        executor = self._get_executor()
+        try:
+            return self._submit(executor, fn, *args)
+        except BrokenProcessPool:
+            # Um processo do pool morreu (OOM, segfault): o executor não se
+            # recupera sozinho, então é trocado por um novo e a tarefa roda de novo
+            self._discard_executor(executor)
+        return self._submit(self._get_executor(), fn, *args)
+
+    def _acquire_slot(self):
+        slots = self._slots
+        if not slots.acquire(blocking=False):
+            raise HashingBusy()
+        return slots
+
+    def _submit(self, executor, fn, *args):
+        slots = self._acquire_slot()
+        try:
+            future = executor.submit(fn, *args)
+        except BaseException:
+            slots.release()
+            raise
+        # O slot só volta quando a tarefa termina de fato: future.cancel() não
+        # interrompe uma tarefa que já está rodando no pool
+        future.add_done_callback(lambda _: slots.release())
+        try:
+            return future.result(timeout=self.timeout)
+        except TimeoutError:
+            future.cancel()
+            raise HashingBusy()
+
+    def _get_executor(self):
+        # O pool é criado sob demanda em cada processo (seguro com workers pré-fork)
+        if self._executor is None or self._executor_pid != os.getpid():
+            with self._lock:
+                if self._executor is None or self._executor_pid != os.getpid():
+                    self._executor = ProcessPoolExecutor(max_workers=self.workers)
+                    self._executor_pid = os.getpid()
+        return self._executor
+
+    def _discard_executor(self, executor):
+        with self._lock:
+            if self._executor is executor:
+                self._executor = None
+        # Sem esperar: as tarefas do pool quebrado já falharam
+        executor.shutdown(wait=False)
+
+
+password_hasher = PasswordHasher()
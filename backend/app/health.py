@@ -0,0 +1,110 @@
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+
+from flask import jsonify
+from sqlalchemy import text
+
+# ===================================
+# LIVENESS / READINESS
+# ===================================
+# /healthz: o processo está vivo (não toca no banco).
+# /readyz:  o worker pode receber tráfego. Fica em 503 até o aquecimento
+#           terminar (conexões do pool abertas e catálogo no cache) e depois
+#           verifica uma conexão do pool com SELECT 1 dentro de um timeout.
+
+logger = logging.getLogger(__name__)
+
+# Leituras aquecidas antes do worker ficar pronto
+WARM_UP_PATHS = ('/products', '/products?include=rating', '/faqs', '/tips')
+
+
+class HealthState:
+    def __init__(self):
+        self.ready = False
+        self.warm_up_error = None
+        self.db_timeout = 2.0
+        self._lock = threading.Lock()
+        # Uma única verificação em andamento: sondas simultâneas esperam por ela
+        # (até o timeout) em vez de abrir outra, e um banco travado não acumula
+        # threads presas
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='readyz')
+        self._pending = None
+
+    def check_database(self, app):
+        with self._lock:
+            future = self._pending
+            if future is None or future.done():
+                future = self._pending = self._executor.submit(_select_one, app)
+        try:
+            future.result(timeout=self.db_timeout)
+            return None
+        except TimeoutError:
+            return f'sem resposta em {self.db_timeout:g}s'
+        except Exception as e:
+            return e.__class__.__name__
+
+
+def _select_one(app):
+    from . import db
+
+    with app.app_context():
+        with db.engine.connect() as connection:
+            connection.execute(text('SELECT 1'))
+
+
+state = HealthState()
+
+
+def warm_up(app, connections=None):
+    """Abre conexões no pool e coloca as leituras do catálogo no cache; depois libera o /readyz."""
+    from . import db
+
+    started = time.perf_counter()
+    try:
+        with app.app_context():
+            connections = connections or app.config['WARM_UP_CONNECTIONS']
+            opened = []
+            try:
+                for _ in range(connections):
+                    opened.append(db.engine.connect())
+            finally:
+                for connection in opened:
+                    connection.close()
+
+        client = app.test_client()
+        for path in WARM_UP_PATHS:
+            response = client.get(path)
+            if response.status_code != 200:
+                raise RuntimeError(f'{path} respondeu {response.status_code}')
+    except Exception as e:
+        # Continua não pronto; o orquestrador tira o worker do balanceamento
+        state.warm_up_error = str(e)
+        logger.exception('Falha no aquecimento')
+        return False
+
+    state.warm_up_error = None
+    state.ready = True
+    logger.info('Aquecimento concluído em %.2fs (%s conexões)', time.perf_counter() - started, len(opened))
+    return True
+
+
+def init_app(app):
+    app.config.setdefault('READINESS_DB_TIMEOUT', float(os.getenv('READINESS_DB_TIMEOUT', 2)))
+    app.config.setdefault('WARM_UP_CONNECTIONS', int(os.getenv('WARM_UP_CONNECTIONS', 4)))
+    state.db_timeout = app.config['READINESS_DB_TIMEOUT']
+
+    @app.route('/healthz')
+    def healthz():
+        return jsonify({'status': 'ok'}), 200
+
+    @app.route('/readyz')
+    def readyz():
+        if not state.ready:
+            return jsonify({'status': 'warming', 'error': state.warm_up_error}), 503
+        error = state.check_database(app)
+        if error:
+            return jsonify({'status': 'unavailable', 'database': error}), 503
+        return jsonify({'status': 'ready', 'database': 'ok'}), 200
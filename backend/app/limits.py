@@ -0,0 +1,50 @@
+import os
+
+from flask import Request, current_app, jsonify
+
+# ===================================
+# TAMANHO MÁXIMO DO CORPO DAS REQUISIÇÕES
+# ===================================
+# MAX_CONTENT_LENGTH vale para todas as rotas: o Werkzeug responde 413 antes
+# de ler além do limite (inclusive no parse de multipart). Rotas que recebem
+# arquivos grandes em streaming, como a importação em lote, declaram o
+# próprio limite com @body_limit (None = sem limite).
+
+_UNSET = object()
+
+
+class LimitedRequest(Request):
+    @property
+    def max_content_length(self):
+        if not current_app:
+            return None
+        view = current_app.view_functions.get(self.endpoint)
+        limit = getattr(view, 'max_content_length', _UNSET)
+        if limit is _UNSET:
+            return current_app.config['MAX_CONTENT_LENGTH']
+        return limit
+
+
+def body_limit(limit):
+    """Limite de corpo (bytes) próprio de uma rota; None desliga o limite."""
+    def decorator(view):
+        view.max_content_length = limit
+        return view
+    return decorator
+
+
+def init_app(app):
+    # Padrão: o maior upload de imagem aceito mais a folga do multipart
+    default = app.config.get('MEDIA_MAX_BYTES', 10 * 1024 * 1024) + 1024 * 1024
+    if app.config.get('MAX_CONTENT_LENGTH') is None:
+        app.config['MAX_CONTENT_LENGTH'] = int(os.getenv('MAX_CONTENT_LENGTH', default))
+    app.request_class = LimitedRequest
+
+    @app.errorhandler(413)
+    def request_too_large(error):
+        limit = app.config['MAX_CONTENT_LENGTH']
+        if limit >= 1024 * 1024:
+            size = f'{limit // (1024 * 1024)} MB'
+        else:
+            size = f'{limit // 1024} KB' if limit >= 1024 else f'{limit} bytes'
+        return jsonify({'error': f'Requisição maior que {size}'}), 413
@@ -0,0 +1,261 @@
+import hashlib
+import io
+import logging
+import os
+import queue
+import threading
+
+from flask import current_app, request
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:  # opcional: sem Pillow só o original é guardado, sem variantes
+    Image = None
+
+# ===================================
+# IMAGENS DE PRODUTOS
+# ===================================
+# O upload guarda o original em static/media com o hash do conteúdo no nome
+# e responde na hora. Um worker em segundo plano gera as variantes (WebP e
+# JPEG em algumas larguras), também com o hash no nome, e atualiza o
+# produto (image_url + image_srcset). Como o nome muda sempre que o conteúdo
+# muda, esses arquivos são servidos com cache "immutable" de um ano.
+
+logger = logging.getLogger(__name__)
+
+MEDIA_DIR = 'media'
+VARIANT_WIDTHS = (320, 640, 1280)
+VARIANT_FORMATS = {
+    'webp': ('WEBP', {'quality': 80, 'method': 4}),
+    'jpg': ('JPEG', {'quality': 82, 'optimize': True, 'progressive': True}),
+}
+IMMUTABLE_MAX_AGE = 365 * 24 * 3600
+
+# Assinaturas dos formatos aceitos (sem depender do Pillow para validar)
+SIGNATURES = (
+    (b'\xff\xd8\xff', 'jpg'),
+    (b'\x89PNG\r\n\x1a\n', 'png'),
+    (b'GIF87a', 'gif'),
+    (b'GIF89a', 'gif'),
+)
+
+
+class MediaError(ValueError):
+    status = 415
+
+
+class ImageTooLarge(MediaError):
+    status = 413
+
+
+def detect_format(data):
+    if data[:4] == b'RIFF' and data[8:12] == b'WEBP':
+        return 'webp'
+    for signature, extension in SIGNATURES:
+        if data.startswith(signature):
+            return extension
+    raise MediaError('formato de imagem não suportado (use JPEG, PNG, WebP ou GIF)')
+
+
+def media_url(name):
+    # MEDIA_BASE_URL (ex.: https://api.pifloor.com ou um CDN) torna a URL
+    # absoluta; sem ele fica relativa ao backend e o frontend completa com a
+    # URL da API
+    return f"{current_app.config['MEDIA_BASE_URL']}{current_app.static_url_path}/{MEDIA_DIR}/{name[:2]}/{name}"
+
+
+def check_dimensions(data):
+    """Recusa imagens com mais pixels que MEDIA_MAX_PIXELS (proteção contra "bombas" de descompressão).
+
+    Só lê o cabeçalho; sem Pillow não há redimensionamento e nada a checar.
+    """
+    if Image is None:
+        return
+    try:
+        with Image.open(io.BytesIO(data)) as image:
+            _check_pixels(image)
+    except Image.DecompressionBombError:
+        raise ImageTooLarge(_too_large_message())
+    except OSError:
+        raise MediaError('arquivo de imagem inválido')
+
+
+def _check_pixels(image):
+    if image.width * image.height > current_app.config['MEDIA_MAX_PIXELS']:
+        raise ImageTooLarge(_too_large_message())
+
+
+def _too_large_message():
+    return f"imagem com mais de {current_app.config['MEDIA_MAX_PIXELS'] // 1_000_000} megapixels"
+
+
+def _media_path(name):
+    return os.path.join(current_app.static_folder, MEDIA_DIR, name[:2], name)
+
+
+def _write_once(name, data):
+    """Grava o arquivo só se ainda não existir (mesmo nome = mesmo conteúdo)."""
+    path = _media_path(name)
+    if os.path.exists(path):
+        return
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temporary = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+    with open(temporary, 'wb') as f:
+        f.write(data)
+    os.replace(temporary, path)
+
+
+def store_original(data):
+    """Valida e grava o arquivo enviado; devolve (hash do conteúdo, URL)."""
+    extension = detect_format(data)
+    check_dimensions(data)
+    content_hash = hashlib.sha256(data).hexdigest()
+    name = f'{content_hash}.{extension}'
+    _write_once(name, data)
+    return content_hash, media_url(name)
+
+
+def render_variants(content_hash, original_url):
+    """Gera as variantes redimensionadas; devolve [{'width', 'format', 'url'}, ...]."""
+    name = original_url.rsplit('/', 1)[-1]
+    with Image.open(_media_path(name)) as source:
+        _check_pixels(source)
+        image = ImageOps.exif_transpose(source)
+        if image.mode not in ('RGB', 'RGBA'):
+            image = image.convert('RGBA' if 'transparency' in image.info or image.mode in ('LA', 'PA') else 'RGB')
+        # Sem ampliar: larguras acima da original viram uma variante na largura original
+        widths = sorted({min(width, image.width) for width in VARIANT_WIDTHS})
+
+        variants = []
+        for width in widths:
+            height = max(1, round(image.height * width / image.width))
+            resized = image.resize((width, height), Image.LANCZOS)
+            for extension, (pil_format, options) in VARIANT_FORMATS.items():
+                frame = resized
+                if pil_format == 'JPEG' and frame.mode == 'RGBA':
+                    frame = Image.new('RGB', frame.size, 'white')
+                    frame.paste(resized, mask=resized.getchannel('A'))
+                buffer = io.BytesIO()
+                frame.save(buffer, pil_format, **options)
+                data = buffer.getvalue()
+                variant_name = f'{content_hash}-{width}w-{hashlib.sha256(data).hexdigest()[:10]}.{extension}'
+                _write_once(variant_name, data)
+                variants.append({'width': width, 'format': extension, 'url': media_url(variant_name)})
+    return variants
+
+
+def srcset(variants, extension='webp'):
+    return ', '.join(f"{v['url']} {v['width']}w" for v in variants if v['format'] == extension) or None
+
+
+def apply_to_product(image, variants):
+    """Atualiza a imagem e o produto com as variantes geradas (sem commit).
+
+    O produto só muda se ainda mostra o original deste upload: um upload mais
+    novo ou uma image_url definida à mão depois não são sobrescritos por um
+    processamento que terminou atrasado. Devolve True se o produto mudou.
+    """
+    from . import db
+    from .models import Product
+
+    image.variants = variants
+    image.status = 'ready'
+    image.error = None
+    jpegs = [v for v in variants if v['format'] == 'jpg']
+    updated = db.session.query(Product).filter(
+        Product.id == image.product_id, Product.image_url == image.original_url
+    ).update({
+        # image_url fica com o maior JPEG (ou o original) para quem não usa srcset
+        Product.image_url: jpegs[-1]['url'] if jpegs else image.original_url,
+        Product.image_srcset: srcset(variants),
+    }, synchronize_session=False)
+    return updated == 1
+
+
+def process_image(image_id):
+    """Gera as variantes de uma ProductImage pendente (roda no worker)."""
+    from . import db
+    from .cache import mark_changed
+    from .models import ProductImage
+
+    image = db.session.get(ProductImage, image_id)
+    if image is None or image.status == 'ready':
+        return
+    try:
+        variants = render_variants(image.content_hash, image.original_url) if Image is not None else []
+    except Exception as e:
+        logger.exception('Falha ao gerar variantes da imagem %s', image_id)
+        image.status = 'failed'
+        image.error = str(e)[:200]
+        db.session.commit()
+        return
+    changed = apply_to_product(image, variants)
+    db.session.commit()
+    if changed:
+        mark_changed('products', f'product:{image.product_id}')
+
+
+class MediaWorker:
+    """Fila de imagens processada por uma thread do próprio processo."""
+
+    def __init__(self):
+        self.app = None
+        self._queue = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        self.app = app
+
+    def submit(self, image_id):
+        self._get_queue().put(image_id)
+
+    def join(self):
+        """Espera a fila esvaziar (scripts e verificações)."""
+        if self._queue is not None and self._pid == os.getpid():
+            self._queue.join()
+
+    def _get_queue(self):
+        # A thread é criada sob demanda em cada processo (seguro com workers pré-fork)
+        if self._queue is None or self._pid != os.getpid():
+            with self._lock:
+                if self._queue is None or self._pid != os.getpid():
+                    self._queue = queue.Queue()
+                    self._pid = os.getpid()
+                    threading.Thread(target=self._run, args=(self._queue,), name='media-worker',
+                                     daemon=True).start()
+        return self._queue
+
+    def _run(self, jobs):
+        while True:
+            image_id = jobs.get()
+            try:
+                with self.app.app_context():
+                    process_image(image_id)
+            except Exception:
+                logger.exception('Erro no worker de imagens')
+            finally:
+                jobs.task_done()
+
+
+media_worker = MediaWorker()
+
+
+def _immutable_cache(response):
+    if response.status_code in (200, 304) and request.path.startswith(f'{current_app.static_url_path}/{MEDIA_DIR}/'):
+        response.cache_control.public = True
+        response.cache_control.max_age = IMMUTABLE_MAX_AGE
+        response.cache_control.immutable = True
+        response.cache_control.no_cache = None
+    return response
+
+
+def init_app(app):
+    app.config.setdefault('MEDIA_MAX_BYTES', int(os.getenv('MEDIA_MAX_BYTES', 10 * 1024 * 1024)))
+    app.config.setdefault('MEDIA_MAX_PIXELS', int(os.getenv('MEDIA_MAX_PIXELS', 40_000_000)))
+    app.config.setdefault('MEDIA_BASE_URL', os.getenv('MEDIA_BASE_URL', '').rstrip('/'))
+    if Image is not None:
+        # Acima disso o Pillow avisa; acima do dobro recusa a imagem
+        Image.MAX_IMAGE_PIXELS = app.config['MEDIA_MAX_PIXELS']
+    media_worker.init_app(app)
+    app.after_request(_immutable_cache)
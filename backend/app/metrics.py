@@ -0,0 +1,203 @@
+import threading
+import time
+
+from flask import Response, g, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# ===================================
+# MÉTRICAS NO FORMATO DO PROMETHEUS (/metrics)
+# ===================================
+# Cada thread escreve só no seu próprio "shard" de contadores, sem lock.
+# O /metrics soma os shards na hora da coleta; shards de threads que já
+# terminaram são incorporados a um acumulador e descartados.
+# Os números são do processo: com vários workers (gunicorn) cada coleta
+# mostra só o worker que atendeu o /metrics.
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class _Shard:
+    __slots__ = ('thread', 'requests', 'latency', 'sql')
+
+    def __init__(self, thread):
+        self.thread = thread
+        self.requests = {}  # (endpoint, method, status) -> quantidade
+        self.latency = {}   # endpoint -> [contagem por bucket..., soma, total]
+        self.sql = {}       # endpoint -> [statements, segundos]
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._shards = []
+        self._retired = _Shard(None)
+
+    def _shard(self):
+        shard = getattr(self._local, 'shard', None)
+        if shard is None:
+            shard = self._local.shard = _Shard(threading.current_thread())
+            with self._lock:
+                self._shards.append(shard)
+        return shard
+
+    def observe(self, endpoint, method, status, duration, sql_count, sql_time):
+        shard = self._shard()
+        key = (endpoint, method, status)
+        shard.requests[key] = shard.requests.get(key, 0) + 1
+
+        latency = shard.latency.get(endpoint)
+        if latency is None:
+            latency = shard.latency[endpoint] = [0] * len(LATENCY_BUCKETS) + [0.0, 0]
+        for i, bound in enumerate(LATENCY_BUCKETS):
+            if duration <= bound:
+                latency[i] += 1
+                break
+        latency[-2] += duration
+        latency[-1] += 1
+
+        sql = shard.sql.get(endpoint)
+        if sql is None:
+            sql = shard.sql[endpoint] = [0, 0.0]
+        sql[0] += sql_count
+        sql[1] += sql_time
+
+    def collect(self):
+        with self._lock:
+            alive = []
+            for shard in self._shards:
+                if shard.thread.is_alive():
+                    alive.append(shard)
+                else:
+                    _merge(self._retired, shard)
+            self._shards = alive
+            total = _Shard(None)
+            _merge(total, self._retired)
+            for shard in alive:
+                _merge(total, shard)
+        return total
+
+
+def _merge(target, source):
+    for key, count in dict(source.requests).items():
+        target.requests[key] = target.requests.get(key, 0) + count
+    for endpoint, values in dict(source.latency).items():
+        current = target.latency.setdefault(endpoint, [0] * len(LATENCY_BUCKETS) + [0.0, 0])
+        for i, value in enumerate(list(values)):
+            current[i] += value
+    for endpoint, values in dict(source.sql).items():
+        current = target.sql.setdefault(endpoint, [0, 0.0])
+        current[0] += values[0]
+        current[1] += values[1]
+
+
+registry = MetricsRegistry()
+
+
+# ===================================
+# GANCHOS (requisição e SQLAlchemy)
+# ===================================
+
+@event.listens_for(Engine, 'before_cursor_execute')
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault('query_start', []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, 'after_cursor_execute')
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info['query_start'].pop()
+    if has_request_context() and 'sql_statements' in g:
+        g.sql_statements += 1
+        g.sql_time += elapsed
+
+
+@event.listens_for(Engine, 'handle_error')
+def _handle_error(context):
+    if context.connection is not None and context.connection.info.get('query_start'):
+        context.connection.info['query_start'].pop()
+
+
+def _before_request():
+    g.request_start = time.perf_counter()
+    g.sql_statements = 0
+    g.sql_time = 0.0
+
+
+def _after_request(response):
+    if 'request_start' in g:
+        registry.observe(
+            request.endpoint or 'unmatched',
+            request.method,
+            response.status_code,
+            time.perf_counter() - g.request_start,
+            g.sql_statements,
+            g.sql_time,
+        )
+    return response
+
+
+def _labels(**labels):
+    return ','.join(f'{key}="{value}"' for key, value in labels.items())
+
+
+def render_metrics():
+    from . import db
+    from .cache import response_cache
+    from .pool import pool_status
+
+    data = registry.collect()
+    lines = [
+        '# HELP http_requests_total Requisições HTTP por endpoint, método e status.',
+        '# TYPE http_requests_total counter',
+    ]
+    for (endpoint, method, status), count in sorted(data.requests.items()):
+        lines.append(f'http_requests_total{{{_labels(endpoint=endpoint, method=method, status=status)}}} {count}')
+
+    lines += [
+        '# HELP http_request_duration_seconds Latência das requisições por endpoint.',
+        '# TYPE http_request_duration_seconds histogram',
+    ]
+    for endpoint, values in sorted(data.latency.items()):
+        cumulative = 0
+        for bound, count in zip(LATENCY_BUCKETS, values):
+            cumulative += count
+            lines.append(f'http_request_duration_seconds_bucket{{{_labels(endpoint=endpoint, le=bound)}}} {cumulative}')
+        lines.append(f'http_request_duration_seconds_bucket{{{_labels(endpoint=endpoint, le="+Inf")}}} {values[-1]}')
+        lines.append(f'http_request_duration_seconds_sum{{{_labels(endpoint=endpoint)}}} {values[-2]:.6f}')
+        lines.append(f'http_request_duration_seconds_count{{{_labels(endpoint=endpoint)}}} {values[-1]}')
+
+    lines += [
+        '# HELP db_statements_total Statements SQL executados por endpoint.',
+        '# TYPE db_statements_total counter',
+    ]
+    lines += [f'db_statements_total{{{_labels(endpoint=e)}}} {v[0]}' for e, v in sorted(data.sql.items())]
+    lines += [
+        '# HELP db_statement_seconds_total Tempo gasto em SQL por endpoint.',
+        '# TYPE db_statement_seconds_total counter',
+    ]
+    lines += [f'db_statement_seconds_total{{{_labels(endpoint=e)}}} {v[1]:.6f}' for e, v in sorted(data.sql.items())]
+
+    cache = response_cache.stats()
+    for name in ('hits', 'misses', 'evictions', 'expirations', 'invalidations'):
+        lines += [f'# TYPE catalog_cache_{name}_total counter', f'catalog_cache_{name}_total {cache[name]}']
+    lines += ['# TYPE catalog_cache_entries gauge', f"catalog_cache_entries {cache['size']}"]
+
+    pool = pool_status(db.engine)
+    for name in ('checked_out', 'idle', 'overflow'):
+        if name in pool:
+            lines += [f'# TYPE db_pool_{name} gauge', f'db_pool_{name} {pool[name]}']
+    if 'wait_seconds_total' in pool:
+        lines += ['# TYPE db_pool_wait_seconds_total counter', f"db_pool_wait_seconds_total {pool['wait_seconds_total']}"]
+        lines += ['# TYPE db_pool_timeouts_total counter', f"db_pool_timeouts_total {pool['timeouts']}"]
+
+    return '\n'.join(lines) + '\n'
+
+
+def init_app(app):
+    app.before_request(_before_request)
+    app.after_request(_after_request)
+
+    @app.route('/metrics')
+    def metrics():
+        return Response(render_metrics(), mimetype='text/plain; version=0.0.4')
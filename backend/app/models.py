@@ -11,7 +11,20 @@ class Product(db.Model):
     image_url = db.Column(db.String(200))
     video_url = db.Column(db.String(200))
     stock = db.Column(db.Integer, nullable=False, default=0)
-    
+    # Agregados de notas mantidos por rate_product/delete_review (ver `flask repair-ratings`)
+    rating_sum = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    rating_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    # Variantes redimensionadas da imagem enviada por upload ("url 320w, url 640w, ...")
+    image_srcset = db.Column(db.Text)
+
+    # Índices da listagem paginada de /products (ordenação + desempate por id)
+    __table_args__ = (
+        db.Index('ix_products_price_id', 'price', 'id'),
+        db.Index('ix_products_name_id', 'name', 'id'),
+        db.Index('ix_products_type_price_id', 'type', 'price', 'id'),
+        db.Index('ix_products_type_name_id', 'type', 'name', 'id'),
+    )
+
 class User(db.Model):
     __tablename__ = 'users'
     id = db.Column(db.Integer, primary_key=True)
@@ -38,6 +51,13 @@ class Review(db.Model):
     comment = db.Column(db.Text)
     created_at = db.Column(db.DateTime, default=db.func.current_timestamp())
 
+    __table_args__ = (
+        # get_reviews: filtro por produto + ORDER BY created_at
+        db.Index('ix_reviews_product_created_id', 'product_id', 'created_at', 'id'),
+        # rate_product: nota de um usuário em um produto
+        db.Index('ix_reviews_product_user', 'product_id', 'user_id'),
+    )
+
 class Tip(db.Model):
     __tablename__ = 'tips'
     id = db.Column(db.Integer, primary_key=True)
@@ -64,5 +84,26 @@ class Favorite(db.Model):
     product_id = db.Column(db.Integer, db.ForeignKey('products.id'), nullable=False)
     created_at = db.Column(db.DateTime, default=db.func.current_timestamp())
 
-    __table_args__ = (db.UniqueConstraint('user_id', 'product_id', name='unique_user_product'),)
-    product = db.relationship("Product", backref="favorites", lazy=True)
\ No newline at end of file
+    __table_args__ = (
+        db.UniqueConstraint('user_id', 'product_id', name='unique_user_product'),
+        # GET /favorites: filtro por usuário paginado pelo id do favorito
+        db.Index('ix_favorites_user_id', 'user_id', 'id'),
+    )
+    product = db.relationship("Product", backref="favorites", lazy=True)
+
+class ProductImage(db.Model):
+    """Imagem enviada por upload; as variantes são geradas em segundo plano (media.py)."""
+    __tablename__ = 'product_images'
+    id = db.Column(db.Integer, primary_key=True)
+    product_id = db.Column(db.Integer, db.ForeignKey('products.id', ondelete='CASCADE'), nullable=False)
+    content_hash = db.Column(db.String(64), nullable=False)
+    original_url = db.Column(db.String(200), nullable=False)
+    status = db.Column(db.String(20), nullable=False, default='pending')  # pending, ready, failed
+    variants = db.Column(db.JSON)
+    error = db.Column(db.String(200))
+    created_at = db.Column(db.DateTime, default=db.func.current_timestamp())
+
+    __table_args__ = (
+        db.Index('ix_product_images_product_id', 'product_id', 'id'),
+        db.Index('ix_product_images_status', 'status'),
+    )
@@ -0,0 +1,65 @@
+import base64
+import json
+
+from sqlalchemy import and_, or_
+
+# ===================================
+# PAGINAÇÃO POR CURSOR (KEYSET)
+# ===================================
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+
+class PaginationError(ValueError):
+    pass
+
+
+def parse_limit(value, default=DEFAULT_PAGE_SIZE, maximum=MAX_PAGE_SIZE):
+    if value in (None, ''):
+        return default
+    try:
+        limit = int(value)
+    except (TypeError, ValueError):
+        raise PaginationError('limit deve ser um número inteiro')
+    if limit < 1:
+        raise PaginationError('limit deve ser maior que zero')
+    return min(limit, maximum)
+
+
+def encode_cursor(*values):
+    """Gera um cursor opaco a partir dos valores da última linha da página."""
+    raw = json.dumps(values, separators=(',', ':'), default=str).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor, size):
+    if not cursor:
+        return None
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+    except (ValueError, TypeError):
+        raise PaginationError('cursor inválido')
+    if not isinstance(values, list) or len(values) != size:
+        raise PaginationError('cursor inválido')
+    return values
+
+
+def keyset_after(column, id_column, value, last_id, descending=False):
+    """Filtro "depois de (value, last_id)" para ORDER BY column, id_column.
+
+    Segue a ordenação de NULLs do MySQL e do SQLite: primeiro em ordem
+    crescente e por último em ordem decrescente.
+    """
+    if descending:
+        if value is None:
+            return and_(column.is_(None), id_column < last_id)
+        return or_(
+            column < value,
+            and_(column == value, id_column < last_id),
+            column.is_(None),
+        )
+    if value is None:
+        return or_(and_(column.is_(None), id_column > last_id), column.isnot(None))
+    return or_(column > value, and_(column == value, id_column > last_id))
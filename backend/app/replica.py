@@ -0,0 +1,81 @@
+import os
+import time
+from functools import wraps
+
+from flask import current_app, g, has_request_context, request
+from flask_sqlalchemy.session import Session
+from sqlalchemy.sql import Select
+
+# ===================================
+# LEITURAS NA RÉPLICA
+# ===================================
+# Com SQLALCHEMY_REPLICA_URI definido, os SELECTs das rotas marcadas com
+# @replica_read vão para a réplica; todo o resto (escritas, flush e rotas
+# sem o decorator) continua no banco principal.
+#
+# Ler o que acabou de escrever: depois de uma escrita a resposta leva o
+# cookie REPLICA_COOKIE, e enquanto ele valer (REPLICA_STICKY_SECONDS) as
+# leituras daquele cliente ficam no principal, em qualquer worker. Os demais
+# clientes continuam na réplica. Enquanto está "grudado" no principal, o
+# cliente também não recebe corpo do cache de respostas nem 304 (ver
+# cache.py): o cache e o ETag de outro worker podem ser anteriores à escrita.
+
+REPLICA_BIND = 'replica'
+REPLICA_COOKIE = 'read_primary_until'
+
+
+class RoutingSession(Session):
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and has_request_context():
+            if self._flushing or (clause is not None and not isinstance(clause, Select)):
+                g.db_written = True
+                g.use_replica = False
+            elif g.get('use_replica') and REPLICA_BIND in self._db.engines:
+                return self._db.engines[REPLICA_BIND]
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+def replica_enabled():
+    return REPLICA_BIND in current_app.config.get('SQLALCHEMY_BINDS', {})
+
+
+def read_primary():
+    """True quando o cliente desta requisição escreveu há pouco e deve ler do principal."""
+    if not replica_enabled():
+        return False
+    if g.get('db_written'):
+        return True
+    try:
+        return float(request.cookies.get(REPLICA_COOKIE, 0)) > time.time()
+    except ValueError:
+        return False
+
+
+def replica_read(view):
+    """Marca uma rota somente leitura: seus SELECTs podem ir para a réplica."""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        g.use_replica = replica_enabled() and not read_primary()
+        return view(*args, **kwargs)
+    return wrapper
+
+
+def _set_sticky_cookie(response):
+    if g.get('db_written') and replica_enabled():
+        window = current_app.config['REPLICA_STICKY_SECONDS']
+        response.set_cookie(REPLICA_COOKIE, f'{time.time() + window:.3f}', max_age=int(window) + 1,
+                            httponly=True, samesite='Lax')
+    return response
+
+
+def replica_binds(engine_options):
+    """SQLALCHEMY_BINDS com a réplica, se SQLALCHEMY_REPLICA_URI estiver definido."""
+    uri = os.getenv('SQLALCHEMY_REPLICA_URI')
+    if not uri:
+        return {}
+    return {REPLICA_BIND: {'url': uri, **engine_options(uri)}}
+
+
+def init_app(app):
+    app.config.setdefault('REPLICA_STICKY_SECONDS', float(os.getenv('REPLICA_STICKY_SECONDS', 5)))
+    app.after_request(_set_sticky_cookie)
@@ -1,9 +1,26 @@
-from flask import Blueprint, jsonify, request
+from flask import Blueprint, Response, current_app, jsonify, request, stream_with_context
 from flask_jwt_extended import jwt_required, get_jwt_identity, create_access_token
-from . import db, bcrypt
-from .models import Product, User, Review, Tip, FAQ, SocialMedia, Favorite, db
+from . import db
+from .models import Product, ProductImage, User, Review, Tip, FAQ, SocialMedia, Favorite, db
+from .auth import current_identity, identity_claims
+from .hashing import HashingBusy, password_hasher
+from .budgets import query_budget
+from .cache import cached, conditional, mark_changed, response_cache
+from .search import search_index, index_product, index_products, index_tip, index_faq, unindex
+from .pool import pool_status
+from .replica import REPLICA_BIND, replica_read
+from .bulk import import_products
+from .stock import StockError, parse_stock_items, apply_stock_deltas
+from .export import EXPORT_FORMATS, export_products
+from .compression import negotiate
+from .limits import body_limit
+from .media import MediaError, media_worker, store_original
+from . import serializers
+from .pagination import PaginationError, parse_limit, encode_cursor, decode_cursor, keyset_after
 from datetime import datetime
+import math
 from flask_cors import CORS
+from sqlalchemy import insert
 
 # ===================================
 # CONFIGURAÇÃO DO BLUEPRINT E CORS
@@ -16,91 +33,233 @@ CORS(bp, supports_credentials=True, origins=["http://localhost:5173"])
 # ===================================
 
 def admin_required():
-    user_id = get_jwt_identity()
-    user = User.query.get(user_id)
-    if not user or not user.is_admin:
+    # is_admin vem das claims assinadas do token (ou do cache de identidades)
+    identity = current_identity() if get_jwt_identity() is not None else None
+    if not identity or not identity.is_admin:
         return jsonify({"msg": "Acesso negado: apenas administradores"}), 403
     return None
 
+def hashing_busy_response():
+    response = jsonify({'error': 'Servidor ocupado, tente novamente em instantes'})
+    response.headers['Retry-After'] = '1'
+    return response, 503
+
 def admin_7_required():
     user_id = get_jwt_identity()
     if str(user_id) != "7":
         return jsonify({"msg": "Acesso negado: apenas o administrador (ID 7)"}), 403
     return None
 
+MAX_RATING_IDS = 200
+
+def rating_summary(rating_sum, rating_count):
+    if not rating_count:
+        return {'average': None, 'count': 0}
+    return {'average': round(rating_sum / rating_count, 1), 'count': rating_count}
+
+def rating_summaries(product_ids):
+    """Resumo das notas de vários produtos, lido dos agregados em uma única consulta."""
+    summaries = {pid: {'average': None, 'count': 0} for pid in product_ids}
+    if not summaries:
+        return summaries
+    rows = db.session.query(
+        Product.id,
+        Product.rating_sum,
+        Product.rating_count
+    ).filter(Product.id.in_(list(summaries))).all()
+    for product_id, rating_sum, rating_count in rows:
+        summaries[product_id] = rating_summary(rating_sum, rating_count)
+    return summaries
+
+def update_rating_aggregates(product_id, sum_delta, count_delta):
+    """Aplica a variação dos agregados com UPDATE atômico, na mesma transação da nota."""
+    Product.query.filter_by(id=product_id).update({
+        Product.rating_sum: Product.rating_sum + sum_delta,
+        Product.rating_count: Product.rating_count + count_delta
+    }, synchronize_session=False)
+
+def rating_histogram(product_id):
+    """Quantidade de notas de 1 a 5 estrelas de um produto, em uma consulta agregada."""
+    histogram = {str(stars): 0 for stars in range(1, 6)}
+    rows = db.session.query(Review.rating, db.func.count(Review.id)).filter(
+        Review.product_id == product_id, Review.rating.isnot(None)
+    ).group_by(Review.rating).all()
+    for rating, count in rows:
+        if str(rating) in histogram:
+            histogram[str(rating)] = count
+    return histogram
+
+def parse_price(value, field):
+    if value in (None, ''):
+        return None
+    try:
+        price = float(value)
+    except ValueError:
+        price = None
+    if price is None or not math.isfinite(price):
+        raise ValueError(f'{field} deve ser um número')
+    return price
+
+SEARCH_KINDS = {'product', 'tip', 'faq'}
+
+# Ordenações aceitas em GET /products: coluna de ordenação e se é decrescente
+PRODUCT_SORTS = {
+    'id': (Product.id, False),
+    'newest': (Product.id, True),
+    'price': (Product.price, False),
+    'price_desc': (Product.price, True),
+    'name': (Product.name, False),
+}
+
+def product_rating_resources():
+    # A listagem só depende das notas quando elas vão na resposta
+    if 'rating' in request.args.get('include', '').split(','):
+        return ('ratings',)
+    return ()
+
 # ===================================
 # ROTAS PÚBLICAS
 # ===================================
 
 @bp.route('/products', methods=['GET'])
+@query_budget(1)
+@replica_read
+@conditional('products', product_rating_resources)
+@cached('products', product_rating_resources)
 def get_products():
-    products = Product.query.all()
-    print("Rota /products chamada")
+    args = request.args
+    sort = args.get('sort', 'id')
+    if sort not in PRODUCT_SORTS:
+        return jsonify({'error': f"sort deve ser um de: {', '.join(PRODUCT_SORTS)}"}), 400
+    sort_column, descending = PRODUCT_SORTS[sort]
+
+    try:
+        limit = parse_limit(args.get('limit'))
+        cursor = decode_cursor(args.get('cursor'), 2)
+    except PaginationError as e:
+        return jsonify({'error': str(e)}), 400
+    try:
+        min_price = parse_price(args.get('min_price'), 'min_price')
+        max_price = parse_price(args.get('max_price'), 'max_price')
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    query = db.session.query(*serializers.products.columns, Product.rating_sum, Product.rating_count)
+    if args.get('type'):
+        query = query.filter(Product.type == args['type'])
+    if min_price is not None:
+        query = query.filter(Product.price >= min_price)
+    if max_price is not None:
+        query = query.filter(Product.price <= max_price)
+    if args.get('in_stock', '').lower() in ('1', 'true', 'sim'):
+        query = query.filter(Product.stock > 0)
+    if cursor:
+        query = query.filter(keyset_after(sort_column, Product.id, cursor[0], cursor[1], descending))
+
+    if descending:
+        query = query.order_by(sort_column.desc(), Product.id.desc())
+    else:
+        query = query.order_by(sort_column.asc(), Product.id.asc())
+
+    # Busca um item a mais para saber se existe próxima página
+    products = query.limit(limit + 1).all()
+    next_cursor = None
+    if len(products) > limit:
+        products = products[:limit]
+        last = products[-1]
+        next_cursor = encode_cursor(getattr(last, sort_column.key), last.id)
+
+    product_list = serializers.products.rows(products)
+
+    if 'rating' in args.get('include', '').split(','):
+        for p, item in zip(products, product_list):
+            item['rating'] = rating_summary(p.rating_sum, p.rating_count)
+
     return jsonify({
         'message': 'Lista de produtos',
-        'products': [
-            {
-                'id': p.id, 
-                'name': p.name, 
-                'price': p.price,
-                'description': p.description,
-                'type': p.type,
-                'image_url': p.image_url,
-                'video_url': p.video_url,
-                'stock': p.stock} 
-        for p in products]
+        'products': product_list,
+        'next_cursor': next_cursor
     })
 
+@bp.route('/products/ratings', methods=['GET'])
+@query_budget(1)
+@replica_read
+def get_products_ratings():
+    try:
+        ids = [int(i) for i in request.args.get('ids', '').split(',') if i.strip()]
+    except ValueError:
+        return jsonify({'error': 'ids deve ser uma lista de números separados por vírgula'}), 400
+    if not ids:
+        return jsonify({'error': 'ids é obrigatório'}), 400
+    if len(ids) > MAX_RATING_IDS:
+        return jsonify({'error': f'no máximo {MAX_RATING_IDS} ids por chamada'}), 400
+
+    ratings = rating_summaries(ids)
+    return jsonify({'ratings': {str(pid): summary for pid, summary in ratings.items()}}), 200
+
 @bp.route('/products/<int:product_id>', methods=['GET'])
+@query_budget(1)
+@replica_read
+@conditional('product:{product_id}')
+@cached('product:{product_id}')
 def get_product_by_id(product_id):
-    product = Product.query.get(product_id)
+    product = db.session.query(*serializers.products.columns).filter(Product.id == product_id).first()
     if not product:
         return jsonify({'error': 'Produto não encontrado'}), 404
 
-    return jsonify({
-        'id': product.id,
-        'name': product.name,
-        'price': product.price,
-        'description': product.description,
-        'type': product.type,
-        'image_url': product.image_url,
-        'video_url': product.video_url,
-        'stock': product.stock
-    }), 200
+    return jsonify(serializers.products.row(product)), 200
 
 
 @bp.route('/tips', methods=['GET'])
+@query_budget(1)
+@replica_read
+@conditional('tips')
+@cached('tips')
 def get_tips():
-    tips = Tip.query.all()
-    print("Rota /tips chamada")
+    tips = db.session.query(*serializers.tips.columns).all()
     return jsonify({
         'message': 'Lista de dicas',
-        'tips': [{'id': t.id, 'title': t.title, 'content': t.content, 'category': t.category} 
-                 for t in tips]
+        'tips': serializers.tips.rows(tips)
     })
 
 @bp.route('/faqs', methods=['GET'])
+@query_budget(1)
+@replica_read
+@conditional('faqs')
+@cached('faqs')
 def get_faqs():
-    faqs = FAQ.query.all()
-    print("Rota /faqs chamada")
+    faqs = db.session.query(*serializers.faqs.columns).all()
     return jsonify({
         'message': 'Lista de FAQs',
-        'faqs': [
-            {
-                'id': f.id,
-                'question': f.question,
-                'answer': f.answer
-            } 
-            for f in faqs
-        ]
+        'faqs': serializers.faqs.rows(faqs)
     })
 
+@bp.route('/search', methods=['GET'])
+def search():
+    query = request.args.get('q', '').strip()
+    if not query:
+        return jsonify({'error': 'q é obrigatório'}), 400
+
+    kinds = None
+    if request.args.get('type'):
+        kinds = set(request.args['type'].split(','))
+        if not kinds <= SEARCH_KINDS:
+            return jsonify({'error': f"type deve ser um de: {', '.join(sorted(SEARCH_KINDS))}"}), 400
+    try:
+        limit = parse_limit(request.args.get('limit'), default=20, maximum=100)
+    except PaginationError as e:
+        return jsonify({'error': str(e)}), 400
+
+    search_index.ensure_built(current_app.config['SEARCH_INDEX_MAX_AGE'])
+    return jsonify({'query': query, 'results': search_index.search(query, kinds, limit)}), 200
+
 
 # ===================================
 # LOGIN E USUÁRIOS
 # ===================================
 
 @bp.route('/users', methods=['POST'])
+@query_budget(3)
 def create_user():
     data = request.json
     username = data.get('username')
@@ -115,7 +274,10 @@ def create_user():
     if existing_user:
         return jsonify({'error': 'Usuário já existe'}), 400
 
-    password_hash = bcrypt.generate_password_hash(password).decode('utf-8')
+    try:
+        password_hash = password_hasher.generate_password_hash(password)
+    except HashingBusy:
+        return hashing_busy_response()
     new_user = User(username=username, email=email, password_hash=password_hash, name=name)
     db.session.add(new_user)
     db.session.commit()
@@ -127,6 +289,7 @@ def create_user():
 
 
 @bp.route('/login', methods=['POST'])
+@query_budget(2)
 def login():
     if request.method == 'OPTIONS':
         response = jsonify({"msg": "CORS preflight ok"})
@@ -143,8 +306,21 @@ def login():
         return jsonify({'error': 'username e password são obrigatórios'}), 400
 
     user = User.query.filter_by(username=username).first()
-    if user and bcrypt.check_password_hash(user.password_hash, password):
-        access_token = create_access_token(identity=str(user.id))
+    try:
+        valid = bool(user) and password_hasher.check_password_hash(user.password_hash, password)
+    except HashingBusy:
+        return hashing_busy_response()
+    # Custo do bcrypt mudou: regrava o hash agora que temos a senha em claro.
+    # Com o pool ocupado fica para o próximo login; a senha já foi conferida.
+    if valid and password_hasher.needs_rehash(user.password_hash):
+        try:
+            user.password_hash = password_hasher.generate_password_hash(password)
+            db.session.commit()
+        except HashingBusy:
+            pass
+
+    if valid:
+        access_token = create_access_token(identity=str(user.id), additional_claims=identity_claims(user))
         return jsonify({
             'message': 'Login bem-sucedido',
             'token': access_token,
@@ -164,6 +340,7 @@ def login():
 # ===================================
 
 @bp.route('/admin/products', methods=['POST', 'OPTIONS'])
+@query_budget(2)
 @jwt_required(optional=True)
 def create_product():
     if request.method == 'OPTIONS':
@@ -192,25 +369,19 @@ def create_product():
     )
     db.session.add(new_product)
     db.session.commit()
+    mark_changed('products')
+    index_product(new_product)
 
     response = jsonify({
         "message": "Produto criado com sucesso!",
-        "product": {
-            "id": new_product.id,
-            "name": new_product.name,
-            "price": new_product.price,
-            "description": new_product.description,
-            "type": new_product.type,
-            "image_url": new_product.image_url,
-            "video_url": new_product.video_url,
-            "stock": new_product.stock
-        }
+        "product": serializers.products.one(new_product)
     })
     response.headers.add("Access-Control-Allow-Origin", "http://localhost:5173")
     response.headers.add("Access-Control-Allow-Credentials", "true")
     return response, 201
 
 @bp.route('/admin/products/<int:product_id>', methods=['PUT', 'OPTIONS'])
+@query_budget(3)
 @jwt_required(optional=True)
 def update_product(product_id):
     if request.method == 'OPTIONS':
@@ -236,30 +407,27 @@ def update_product(product_id):
     if "price" in data: product.price = float(data["price"])
     if "description" in data: product.description = data["description"]
     if "type" in data: product.type = data["type"]
-    if "image_url" in data: product.image_url = data["image_url"]
+    if "image_url" in data:
+        # URL informada à mão: as variantes de um upload anterior deixam de valer
+        product.image_url = data["image_url"]
+        product.image_srcset = None
     if "video_url" in data: product.video_url = data["video_url"]
     if "stock" in data: product.stock = int(data["stock"])
 
     db.session.commit()
+    mark_changed('products', f'product:{product_id}')
+    index_product(product)
 
     response = jsonify({
         "message": "Produto atualizado com sucesso!",
-        "product": {
-            "id": product.id,
-            "name": product.name,
-            "price": product.price,
-            "description": product.description,
-            "type": product.type,
-            "image_url": product.image_url,
-            "video_url": product.video_url,
-            "stock": product.stock
-        }
+        "product": serializers.products.one(product)
     })
     response.headers.add("Access-Control-Allow-Origin", "http://localhost:5173")
     response.headers.add("Access-Control-Allow-Credentials", "true")
     return response, 200
 
 @bp.route('/admin/products/<int:product_id>', methods=['DELETE', 'OPTIONS'])
+@query_budget(3)
 @jwt_required()
 def delete_product(product_id):
     if request.method == 'OPTIONS':
@@ -280,6 +448,8 @@ def delete_product(product_id):
 
     db.session.delete(product)
     db.session.commit()
+    mark_changed('products', f'product:{product_id}')
+    unindex('product', product_id)
 
     response = jsonify({"message": "Produto excluído com sucesso!"})
     response.headers.add("Access-Control-Allow-Origin", "http://localhost:5173")
@@ -287,11 +457,144 @@ def delete_product(product_id):
     return response, 200
 
 
+BULK_CONTENT_TYPES = ('application/x-ndjson', 'application/ndjson', 'text/csv')
+
+@bp.route('/admin/products/bulk', methods=['POST'])
+@body_limit(None)  # lido em streaming, linha a linha
+@jwt_required()
+def bulk_import_products():
+    admin_check = admin_required()
+    if admin_check:
+        return admin_check
+
+    if request.mimetype not in BULK_CONTENT_TYPES:
+        return jsonify({'error': f"Content-Type deve ser um de: {', '.join(BULK_CONTENT_TYPES)}"}), 415
+
+    batch_size = request.args.get('batch_size', 1000, type=int)
+    # Os produtos novos são os de id maior que o último antes da importação
+    last_id = db.session.query(db.func.max(Product.id)).scalar() or 0
+    report = import_products(request.stream, request.mimetype, max(1, min(batch_size, 5000)))
+    if report.created or report.upserted:
+        mark_changed('products', *(f'product:{pid}' for pid in report.upserted_ids))
+        index_products(report.upserted_ids, after_id=last_id if report.created else None)
+
+    return jsonify({'message': 'Importação concluída', **report.to_dict()}), 200
+
+
+def stock_response(items, atomic):
+    results = apply_stock_deltas(items, atomic=atomic)
+    changed = {r['product_id'] for r in results if r['ok']}
+    if changed:
+        mark_changed('products', *(f'product:{pid}' for pid in changed))
+    status = 200 if all(r['ok'] for r in results) else 409
+    return jsonify({'items': results}), status
+
+
+@bp.route('/admin/products/stock', methods=['POST'])
+@jwt_required()
+def adjust_products_stock():
+    admin_check = admin_required()
+    if admin_check:
+        return admin_check
+
+    data = request.get_json(silent=True)
+    try:
+        items = parse_stock_items(data)
+    except StockError as e:
+        return jsonify({'error': str(e)}), 400
+    return stock_response(items, atomic=bool(data.get('atomic', False)))
+
+
+@bp.route('/products/stock/decrement', methods=['POST'])
+@jwt_required()
+def decrement_products_stock():
+    # Baixa de estoque de uma compra: ou todos os itens saem, ou nenhum
+    try:
+        items = parse_stock_items(request.get_json(silent=True), field='quantity', positive=True)
+    except StockError as e:
+        return jsonify({'error': str(e)}), 400
+    return stock_response([(product_id, -quantity) for product_id, quantity in items], atomic=True)
+
+
+@bp.route('/products/export', methods=['GET'])
+@jwt_required()
+def export_catalog():
+    admin_check = admin_required()
+    if admin_check:
+        return admin_check
+
+    fmt = request.args.get('format', 'ndjson')
+    if fmt not in EXPORT_FORMATS:
+        return jsonify({'error': f"format deve ser um de: {', '.join(EXPORT_FORMATS)}"}), 400
+
+    encoding = negotiate()
+    response = Response(stream_with_context(export_products(fmt, encoding)), mimetype=EXPORT_FORMATS[fmt])
+    response.headers['Content-Disposition'] = f'attachment; filename=produtos.{fmt}'
+    response.vary.add('Accept-Encoding')
+    if encoding:
+        response.content_encoding = encoding
+    return response
+
+
+@bp.route('/admin/products/<int:product_id>/image', methods=['POST'])
+@query_budget(3)
+@jwt_required()
+def upload_product_image(product_id):
+    admin_check = admin_required()
+    if admin_check:
+        return admin_check
+
+    upload = request.files.get('image')
+    if upload is None:
+        return jsonify({'error': "Envie a imagem no campo 'image' (multipart/form-data)"}), 400
+    max_bytes = current_app.config['MEDIA_MAX_BYTES']
+    data = upload.stream.read(max_bytes + 1)
+    if len(data) > max_bytes:
+        return jsonify({'error': f'Imagem maior que {max_bytes // (1024 * 1024)} MB'}), 413
+
+    product = db.session.get(Product, product_id)
+    if not product:
+        return jsonify({'error': 'Produto não encontrado'}), 404
+    try:
+        content_hash, original_url = store_original(data)
+    except MediaError as e:
+        return jsonify({'error': str(e)}), e.status
+
+    image = ProductImage(product_id=product_id, content_hash=content_hash, original_url=original_url)
+    db.session.add(image)
+    # O original já aparece no catálogo; o worker troca pelas variantes quando terminar
+    product.image_url = original_url
+    product.image_srcset = None
+    db.session.flush()
+    # Serializa antes do commit para não recarregar a imagem do banco
+    payload = serializers.product_images.one(image)
+    db.session.commit()
+    mark_changed('products', f'product:{product_id}')
+    media_worker.submit(payload['id'])
+
+    return jsonify({'message': 'Imagem recebida; variantes em processamento', 'image': payload}), 202
+
+
+@bp.route('/admin/images/<int:image_id>', methods=['GET'])
+@query_budget(2)
+@jwt_required()
+def get_product_image(image_id):
+    admin_check = admin_required()
+    if admin_check:
+        return admin_check
+
+    image = db.session.get(ProductImage, image_id)
+    if not image:
+        return jsonify({'error': 'Imagem não encontrada'}), 404
+    return jsonify(serializers.product_images.one(image)), 200
+
+
 # ===================================
 # OUTRAS ROTAS ADMIN
 # ===================================
 
 @bp.route('/admin/tips', methods=['POST'])
+@query_budget(2)
 @jwt_required()
 def create_tip():
     admin_check = admin_required()
@@ -309,11 +612,14 @@ def create_tip():
     new_tip = Tip(title=title, content=content, category=category)
     db.session.add(new_tip)
     db.session.commit()
+    mark_changed('tips')
+    index_tip(new_tip)
 
     return jsonify({'message': 'Dica criada com sucesso', 'tip': {'id': new_tip.id, 'title': new_tip.title}})
 
 
 @bp.route('/admin/faqs', methods=['POST'])
+@query_budget(2)
 @jwt_required()
 def create_faq():
     admin_check = admin_required()
@@ -330,10 +636,13 @@ def create_faq():
     new_faq = FAQ(question=question, answer=answer)
     db.session.add(new_faq)
     db.session.commit()
+    mark_changed('faqs')
+    index_faq(new_faq)
 
     return jsonify({'message': 'FAQ criado com sucesso', 'faq': {'id': new_faq.id, 'question': new_faq.question}})
 
 @bp.route('/admin/faqs/<int:faq_id>', methods=['DELETE', 'OPTIONS'])
+@query_budget(2)
 @jwt_required()
 def delete_faq(faq_id):
     if request.method == 'OPTIONS':
@@ -354,6 +663,8 @@ def delete_faq(faq_id):
 
     db.session.delete(faq)
     db.session.commit()
+    mark_changed('faqs')
+    unindex('faq', faq_id)
 
     response = jsonify({"message": "FAQ deletado com sucesso"})
     response.headers.add("Access-Control-Allow-Origin", "http://localhost:5173")
@@ -362,6 +673,7 @@ def delete_faq(faq_id):
 
 
 @bp.route('/admin/social-media', methods=['POST'])
+@query_budget(2)
 @jwt_required()
 def create_social_media():
     admin_check = admin_required()
@@ -381,9 +693,30 @@ def create_social_media():
 
     return jsonify({
         'message': 'Rede social adicionada com sucesso',
-        'social_media': {'id': new_social.id, 'platform': new_social.platform, 'url': new_social.url}
+        'social_media': serializers.social_media.one(new_social)
     })
 
+@bp.route('/admin/cache', methods=['GET'])
+@jwt_required()
+def get_cache_stats():
+    admin_check = admin_required()
+    if admin_check:
+        return admin_check
+
+    return jsonify(response_cache.stats()), 200
+
+@bp.route('/admin/pool', methods=['GET'])
+@jwt_required()
+def get_pool_stats():
+    admin_check = admin_required()
+    if admin_check:
+        return admin_check
+
+    stats = pool_status(db.engine)
+    if REPLICA_BIND in db.engines:
+        stats['replica'] = pool_status(db.engines[REPLICA_BIND])
+    return jsonify(stats), 200
+
 # ===================================
 # FAVORITOS
 # ===================================
@@ -396,7 +729,37 @@ def cors_response(msg="CORS preflight ok"):
     response.headers.add("Access-Control-Allow-Methods", "GET,POST,DELETE,OPTIONS")
     return response
 
+MAX_FAVORITES_BATCH = 500
+
+def insert_favorites(user_id, product_ids):
+    """INSERT que ignora pares (user_id, product_id) já existentes.
+
+    Conta com a constraint unique_user_product em vez de consultar antes,
+    então é seguro sob requisições concorrentes. Retorna quantos entraram.
+    """
+    if not product_ids:
+        return 0
+    rows = [{'user_id': user_id, 'product_id': pid, 'created_at': datetime.now()} for pid in product_ids]
+    dialect = db.engine.dialect.name
+    if dialect == 'mysql':
+        stmt = insert(Favorite).prefix_with('IGNORE').values(rows)
+    elif dialect == 'sqlite':
+        from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+        stmt = sqlite_insert(Favorite).values(rows).on_conflict_do_nothing()
+    else:
+        from sqlalchemy.dialects.postgresql import insert as pg_insert
+        stmt = pg_insert(Favorite).values(rows).on_conflict_do_nothing()
+    return db.session.execute(stmt).rowcount
+
+def favorite_ids_list(value, field):
+    if value is None:
+        return []
+    if not isinstance(value, list) or not all(isinstance(v, int) and not isinstance(v, bool) for v in value):
+        raise ValueError(f'{field} deve ser uma lista de ids de produtos')
+    return sorted(set(value))
+
 @bp.route("/favorites", methods=["GET", "POST", "OPTIONS"])
+@query_budget(2)
 @jwt_required()
 def favorites():
     if request.method == "OPTIONS":
@@ -412,35 +775,41 @@ def favorites():
             product_id = data.get("product_id")
             if not product_id:
                 return jsonify({"error": "product_id é obrigatório"}), 400
+            # O INSERT ignora conflitos; sem esta checagem um id inexistente passaria como sucesso
+            if not db.session.query(Product.id).filter(Product.id == product_id).first():
+                return jsonify({"error": "Produto não encontrado", "not_found": [product_id]}), 404
 
-            existing_fav = Favorite.query.filter_by(user_id=user_id, product_id=product_id).first()
-            if existing_fav:
+            added = insert_favorites(int(user_id), [product_id])
+            db.session.commit()
+            if not added:
                 return jsonify({"message": "Produto já favoritado"}), 200
 
-            new_fav = Favorite(user_id=user_id, product_id=product_id, created_at=datetime.now())
-            db.session.add(new_fav)
-            db.session.commit()
             response = jsonify({"message": "Produto adicionado aos favoritos"})
             response.headers.add("Access-Control-Allow-Origin", "http://localhost:5173")
             response.headers.add("Access-Control-Allow-Credentials", "true")
             return response, 201
 
-        favorites = Favorite.query.filter_by(user_id=user_id).all()
-        products = []
-        for fav in favorites:
-            product = Product.query.get(fav.product_id)
-            if product:
-                products.append({
-                    "id": product.id,
-                    "name": product.name,
-                    "price": product.price,
-                    "description": product.description,
-                    "image_url": product.image_url,
-                    "video_url": product.video_url,
-                    "type": product.type,
-                    "stock": product.stock
-                })
-        response = jsonify({"message": "Favoritos do usuário", "favorites": products})
+        try:
+            limit = parse_limit(request.args.get("limit"))
+            cursor = decode_cursor(request.args.get("cursor"), 1)
+        except PaginationError as e:
+            return jsonify({"error": str(e)}), 400
+
+        # Um único SELECT com JOIN em products, paginado pelo id do favorito
+        query = db.session.query(Favorite.id, *serializers.products.columns).join(
+            Product, Favorite.product_id == Product.id
+        ).filter(Favorite.user_id == user_id)
+        if cursor:
+            query = query.filter(Favorite.id > cursor[0])
+        rows = query.order_by(Favorite.id).limit(limit + 1).all()
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(rows[-1][0])
+
+        products = serializers.products.rows(row[1:] for row in rows)
+        response = jsonify({"message": "Favoritos do usuário", "favorites": products, "next_cursor": next_cursor})
         response.headers.add("Access-Control-Allow-Origin", "http://localhost:5173")
         response.headers.add("Access-Control-Allow-Credentials", "true")
         return response, 200
@@ -450,7 +819,60 @@ def favorites():
         return jsonify({"error": "Erro ao processar favoritos"}), 500
 
 
+@bp.route("/favorites/ids", methods=["GET"])
+@query_budget(1)
+@jwt_required()
+def favorite_ids():
+    # Só os ids, para marcar os corações na grade de produtos. O ETag vem do
+    # próprio conteúdo: com If-None-Match igual a resposta é um 304 sem corpo.
+    user_id = int(get_jwt_identity())
+    ids = [pid for pid, in db.session.query(Favorite.product_id).filter(
+        Favorite.user_id == user_id).order_by(Favorite.product_id)]
+
+    response = jsonify({"ids": ids})
+    response.add_etag()
+    response.cache_control.private = True
+    response.cache_control.no_cache = True
+    return response.make_conditional(request)
+
+
+@bp.route("/favorites/batch", methods=["POST"])
+@query_budget(3)
+@jwt_required()
+def favorites_batch():
+    user_id = int(get_jwt_identity())
+    data = request.get_json(silent=True) or {}
+    try:
+        to_add = favorite_ids_list(data.get("add"), "add")
+        to_remove = favorite_ids_list(data.get("remove"), "remove")
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    if len(to_add) + len(to_remove) > MAX_FAVORITES_BATCH:
+        return jsonify({"error": f"no máximo {MAX_FAVORITES_BATCH} alterações por requisição"}), 400
+    if set(to_add) & set(to_remove):
+        return jsonify({"error": "o mesmo produto não pode estar em add e remove"}), 400
+
+    # Tudo na mesma transação: ids inexistentes são ignorados e informados
+    existing = set()
+    if to_add:
+        existing = {pid for pid, in db.session.query(Product.id).filter(Product.id.in_(to_add))}
+    added = insert_favorites(user_id, [pid for pid in to_add if pid in existing])
+    removed = 0
+    if to_remove:
+        removed = Favorite.query.filter(
+            Favorite.user_id == user_id, Favorite.product_id.in_(to_remove)
+        ).delete(synchronize_session=False)
+    db.session.commit()
+
+    return jsonify({
+        "added": added,
+        "removed": removed,
+        "not_found": [pid for pid in to_add if pid not in existing]
+    }), 200
+
+
 @bp.route("/favorites/<int:product_id>", methods=["DELETE", "OPTIONS"])
+@query_budget(2)
 @jwt_required()  # usuário deve estar logado
 def remove_favorite(product_id):
     if request.method == "OPTIONS":
@@ -482,26 +904,45 @@ def remove_favorite(product_id):
 # ===================================
 
 @bp.route('/products/<int:product_id>/reviews', methods=['GET'])
+@query_budget(2)
+@replica_read
+@cached('reviews:{product_id}')
 def get_reviews(product_id):
-    reviews = Review.query.filter_by(product_id=product_id).join(User).add_columns(
-        Review.id,
-        Review.user_id,
-        User.name,
-        Review.comment,
-        Review.created_at).order_by(Review.created_at.desc()).all()
-    review_list = [
-        {
-            "id": r.id,
-            "user_id": r.user_id,
-            "user_name": r.name,
-            "comment": r.comment,
-            "created_at": r.created_at.strftime('%d/%m/%Y %H:%M')
-        }
-        for r in reviews
-    ]
-    return jsonify(review_list), 200
+    try:
+        limit = parse_limit(request.args.get('limit'), default=20, maximum=100)
+        cursor = decode_cursor(request.args.get('cursor'), 2)
+    except PaginationError as e:
+        return jsonify({'error': str(e)}), 400
+    if cursor and cursor[0] is not None:
+        try:
+            cursor[0] = datetime.fromisoformat(cursor[0])
+        except (TypeError, ValueError):
+            return jsonify({'error': 'cursor inválido'}), 400
+
+    # Mais recentes primeiro, paginado por (created_at, id)
+    query = db.session.query(*serializers.reviews.columns).join(User, Review.user_id == User.id).filter(
+        Review.product_id == product_id)
+    if cursor:
+        query = query.filter(keyset_after(Review.created_at, Review.id, cursor[0], cursor[1], descending=True))
+    reviews = query.order_by(Review.created_at.desc(), Review.id.desc()).limit(limit + 1).all()
+
+    next_cursor = None
+    if len(reviews) > limit:
+        reviews = reviews[:limit]
+        last = reviews[-1]
+        next_cursor = encode_cursor(last.created_at.isoformat() if last.created_at else None, last.id)
+
+    result = {'reviews': serializers.reviews.rows(reviews), 'next_cursor': next_cursor}
+    # O resumo só vai na primeira página
+    if not cursor:
+        histogram = rating_histogram(product_id)
+        count = sum(histogram.values())
+        total = sum(int(stars) * n for stars, n in histogram.items())
+        result['summary'] = {**rating_summary(total, count), 'histogram': histogram}
+    return jsonify(result), 200
 
 @bp.route('/products/<int:product_id>/reviews', methods=['POST'])
+@query_budget(1)
 def add_review(product_id):
     data = request.get_json()
     user_id = data.get('user_id')
@@ -521,10 +962,12 @@ def add_review(product_id):
     )
     db.session.add(new_review)
     db.session.commit()
+    mark_changed(f'reviews:{product_id}')
 
     return jsonify({'message': 'Comentário adicionado com sucesso'}), 201
 
 @bp.route('/products/<int:product_id>/reviews/<int:review_id>', methods=['DELETE'])
+@query_budget(3)
 @jwt_required()
 def delete_review(product_id, review_id):
     user_id = int(get_jwt_identity())
@@ -536,8 +979,15 @@ def delete_review(product_id, review_id):
     if review.user_id != user_id:
         return jsonify({"error": "Não autorizado a deletar este comentário"}), 403
 
+    rated = review.rating is not None
+    if rated:
+        update_rating_aggregates(product_id, -review.rating, -1)
     db.session.delete(review)
     db.session.commit()
+    if rated:
+        mark_changed('ratings', f'reviews:{product_id}')
+    else:
+        mark_changed(f'reviews:{product_id}')
     return jsonify({"message": "Comentário deletado com sucesso"}), 200
 
 # ===================================
@@ -545,6 +995,7 @@ def delete_review(product_id, review_id):
 # ===================================
 
 @bp.route('/products/<int:product_id>/rating', methods=['POST'])
+@query_budget(3)
 @jwt_required()
 def rate_product(product_id):
     user_id = int(get_jwt_identity())
@@ -557,8 +1008,13 @@ def rate_product(product_id):
     review = Review.query.filter_by(product_id=product_id, user_id=user_id).first()
 
     if review:
+        previous = review.rating
         review.rating = rating
         review.created_at = datetime.utcnow()
+        if previous is None:
+            update_rating_aggregates(product_id, rating, 1)
+        else:
+            update_rating_aggregates(product_id, rating - previous, 0)
     else:
         review = Review(
             product_id=product_id,
@@ -567,20 +1023,17 @@ def rate_product(product_id):
             created_at=datetime.utcnow()
         )
         db.session.add(review)
+        update_rating_aggregates(product_id, rating, 1)
 
     db.session.commit()
+    mark_changed('ratings', f'reviews:{product_id}')
     return jsonify({'message': 'Nota registrada com sucesso'}), 200
 
 @bp.route('/products/<int:product_id>/rating', methods=['GET'])
+@query_budget(1)
+@replica_read
 def get_product_rating(product_id):
-    ratings = Review.query.filter_by(product_id=product_id).with_entities(Review.rating).all()
-    if not ratings:
+    row = db.session.query(Product.rating_sum, Product.rating_count).filter_by(id=product_id).first()
+    if not row:
         return jsonify({'average': None, 'count': 0}), 200
-
-    values = [r.rating for r in ratings if r.rating is not None]
-    if not values:
-        return jsonify({'average': None, 'count': 0}), 200
-
-    avg = round(sum(values) / len(values), 1)
-    return jsonify({'average': avg, 'count': len(values)}), 200
-
+    return jsonify(rating_summary(row.rating_sum, row.rating_count)), 200
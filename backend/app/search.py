@@ -0,0 +1,259 @@
+import math
+import re
+import threading
+import time
+import unicodedata
+from collections import Counter
+
+from flask import current_app
+
+from .models import Product, Tip, FAQ
+
+# ===================================
+# BUSCA TEXTUAL (ÍNDICE INVERTIDO + BM25)
+# ===================================
+# O índice fica na memória do processo. É montado a partir do banco na
+# primeira busca e depois atualizado pelas rotas admin (index_* / unindex).
+# Como outros workers não veem essas atualizações, ele é remontado em
+# segundo plano quando passa de SEARCH_INDEX_MAX_AGE segundos (0 desativa);
+# as buscas continuam na versão anterior até a nova ficar pronta.
+
+K1 = 1.2
+B = 0.75
+TITLE_WEIGHT = 2
+SNIPPET_LENGTH = 160
+
+STOPWORDS = frozenset("""
+a ao aos as com como da das de do dos e em entre era eu foi ha isso isto ja
+mais mas me mesmo muito na nas nao no nos o os ou para pela pelas pelo pelos
+por qual quando que se sem ser seu sua suas seus so sobre tambem te tem um uma
+umas uns voce
+""".split())
+
+# Sufixos removidos pelo stemmer, do mais longo para o mais curto
+SUFFIXES = (
+    'amentos', 'imentos', 'amento', 'imento', 'mente', 'acoes', 'icoes',
+    'acao', 'icao', 'idade', 'ismos', 'istas', 'ismo', 'ista', 'aveis',
+    'iveis', 'avel', 'ivel', 'osos', 'osas', 'oso', 'osa',
+)
+
+# Plurais (já sem acento), na ordem em que são testados
+PLURALS = (('oes', 'ao'), ('aes', 'ao'), ('ais', 'al'), ('eis', 'el'), ('ois', 'ol'), ('ns', 'm'), ('res', 'r'))
+
+_TOKEN = re.compile(r'[a-z0-9]+')
+
+
+def fold(text):
+    """Minúsculas e sem acentos: 'Vinílico' -> 'vinilico'."""
+    decomposed = unicodedata.normalize('NFKD', text.lower())
+    return ''.join(ch for ch in decomposed if not unicodedata.combining(ch))
+
+
+def stem(word):
+    """Stemmer leve para português: plural, sufixos comuns e vogal temática."""
+    if len(word) <= 3 or word.isdigit():
+        return word
+    for suffix, replacement in PLURALS:
+        if word.endswith(suffix):
+            word = word[:-len(suffix)] + replacement
+            break
+    else:
+        if word.endswith('s'):
+            word = word[:-1]
+    for suffix in SUFFIXES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+            word = word[:-len(suffix)]
+            break
+    if len(word) > 4 and word[-1] in 'aeo':
+        word = word[:-1]
+    return word
+
+
+def tokenize(text):
+    return [stem(token) for token in _TOKEN.findall(fold(text or '')) if token not in STOPWORDS]
+
+
+def _document(title, body):
+    terms = Counter(tokenize(title) * TITLE_WEIGHT + tokenize(body))
+    return (title, (body or '')[:SNIPPET_LENGTH], terms, sum(terms.values()))
+
+
+class _IndexData:
+    """Documentos, listas invertidas e tamanho total de uma versão do índice."""
+
+    def __init__(self):
+        self.docs = {}
+        self.postings = {}
+        self.total_length = 0
+
+    def add(self, key, doc):
+        self.remove(key)
+        self.docs[key] = doc
+        self.total_length += doc[3]
+        for term, freq in doc[2].items():
+            self.postings.setdefault(term, {})[key] = freq
+
+    def remove(self, key):
+        doc = self.docs.pop(key, None)
+        if doc is None:
+            return
+        self.total_length -= doc[3]
+        for term in doc[2]:
+            postings = self.postings.get(term)
+            if postings is not None:
+                postings.pop(key, None)
+                if not postings:
+                    del self.postings[term]
+
+
+class SearchIndex:
+    """Índice em memória. A remontagem a partir do banco roda fora do lock
+    (em segundo plano quando o índice só está velho) e a nova versão entra
+    no lugar da antiga de uma vez. As alterações feitas durante a remontagem
+    ficam em um diário e são reaplicadas na versão nova antes da troca.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._build_lock = threading.Lock()
+        self._built_at = None
+        self._data = _IndexData()
+        self._journal = None
+        self._rebuilding = False
+
+    def add(self, kind, doc_id, title, body):
+        doc = _document(title, body)
+        with self._lock:
+            self._data.add((kind, doc_id), doc)
+            if self._journal is not None:
+                self._journal.append(((kind, doc_id), doc))
+
+    def remove(self, kind, doc_id):
+        with self._lock:
+            self._data.remove((kind, doc_id))
+            if self._journal is not None:
+                self._journal.append(((kind, doc_id), None))
+
+    @property
+    def built(self):
+        # Durante a primeira montagem as alterações também valem (vão para o diário)
+        return self._built_at is not None or self._journal is not None
+
+    def ensure_built(self, max_age=0):
+        if self._built_at is None:
+            # Primeira busca do processo: não há índice para servir enquanto isso
+            with self._build_lock:
+                if self._built_at is None:
+                    self._rebuild()
+            return
+        if not max_age or time.monotonic() - self._built_at < max_age:
+            return
+        with self._lock:
+            if self._rebuilding:
+                return
+            self._rebuilding = True
+        threading.Thread(target=self._rebuild_in_background, args=(current_app._get_current_object(),),
+                         name='search-index', daemon=True).start()
+
+    def _rebuild_in_background(self, app):
+        try:
+            with app.app_context(), self._build_lock:
+                self._rebuild()
+        except Exception:
+            app.logger.exception('Falha ao remontar o índice de busca')
+        finally:
+            self._rebuilding = False
+
+    def _rebuild(self):
+        with self._lock:
+            self._journal = []
+        data = _IndexData()
+        try:
+            for p in Product.query.with_entities(Product.id, Product.name, Product.description).yield_per(1000):
+                data.add(('product', p.id), _document(p.name, p.description))
+            for t in Tip.query.with_entities(Tip.id, Tip.title, Tip.content).yield_per(1000):
+                data.add(('tip', t.id), _document(t.title, t.content))
+            for f in FAQ.query.with_entities(FAQ.id, FAQ.question, FAQ.answer).yield_per(1000):
+                data.add(('faq', f.id), _document(f.question, f.answer))
+        except BaseException:
+            with self._lock:
+                self._journal = None
+            raise
+        with self._lock:
+            for key, doc in self._journal:
+                if doc is None:
+                    data.remove(key)
+                else:
+                    data.add(key, doc)
+            self._data, self._journal = data, None
+            self._built_at = time.monotonic()
+
+    def search(self, query, kinds=None, limit=20):
+        terms = set(tokenize(query))
+        with self._lock:
+            data = self._data
+            total_docs = len(data.docs)
+            if not terms or not total_docs:
+                return []
+            avg_length = data.total_length / total_docs
+            scores = Counter()
+            for term in terms:
+                postings = data.postings.get(term)
+                if not postings:
+                    continue
+                idf = math.log(1 + (total_docs - len(postings) + 0.5) / (len(postings) + 0.5))
+                for key, freq in postings.items():
+                    if kinds and key[0] not in kinds:
+                        continue
+                    length = data.docs[key][3]
+                    scores[key] += idf * freq * (K1 + 1) / (freq + K1 * (1 - B + B * length / avg_length))
+            return [
+                {
+                    'type': kind,
+                    'id': doc_id,
+                    'title': data.docs[(kind, doc_id)][0],
+                    'snippet': data.docs[(kind, doc_id)][1],
+                    'score': round(score, 4)
+                }
+                for (kind, doc_id), score in scores.most_common(limit)
+            ]
+
+
+search_index = SearchIndex()
+
+
+# Atualizações incrementais chamadas pelas rotas admin; se o índice ainda não
+# foi montado, não há nada a fazer (ele virá completo do banco).
+
+def index_product(product):
+    if search_index.built:
+        search_index.add('product', product.id, product.name, product.description)
+
+
+def index_products(ids=(), after_id=None):
+    """Indexa produtos gravados em lote: os ids informados e os criados depois de after_id."""
+    if not search_index.built:
+        return
+    query = Product.query.with_entities(Product.id, Product.name, Product.description)
+    if after_id is not None:
+        for p in query.filter(Product.id > after_id).yield_per(1000):
+            search_index.add('product', p.id, p.name, p.description)
+    ids = sorted(ids)
+    for start in range(0, len(ids), 1000):
+        for p in query.filter(Product.id.in_(ids[start:start + 1000])):
+            search_index.add('product', p.id, p.name, p.description)
+
+
+def index_tip(tip):
+    if search_index.built:
+        search_index.add('tip', tip.id, tip.title, tip.content)
+
+
+def index_faq(faq):
+    if search_index.built:
+        search_index.add('faq', faq.id, faq.question, faq.answer)
+
+
+def unindex(kind, doc_id):
+    if search_index.built:
+        search_index.remove(kind, doc_id)
@@ -0,0 +1,125 @@
+import os
+from operator import attrgetter
+
+from flask.json.provider import DefaultJSONProvider
+
+from .models import Product, ProductImage, Review, Tip, FAQ, SocialMedia, User
+
+try:
+    import orjson
+except ImportError:  # opcional: sem orjson fica o json da biblioteca padrão
+    orjson = None
+
+# ===================================
+# SERIALIZADORES
+# ===================================
+# Um serializador por modelo, com a lista de campos definida uma única vez.
+# As rotas consultam só as colunas (serializer.columns) e montam o JSON
+# direto das tuplas, sem instanciar objetos do ORM; objetos já carregados
+# (criação/edição) passam por serializer.one().
+
+
+class Serializer:
+    def __init__(self, fields, formatters=None):
+        """fields: nome no JSON -> coluna; formatters: nome -> função aplicada ao valor."""
+        self.fields = tuple(fields)
+        self.columns = tuple(fields.values())
+        self._getter = attrgetter(*(column.key for column in self.columns))
+        self._formatters = [(self.fields.index(name), fn) for name, fn in (formatters or {}).items()]
+
+    def row(self, row):
+        """Uma tupla no formato de self.columns -> dicionário."""
+        if self._formatters:
+            row = list(row[:len(self.fields)])
+            for i, fn in self._formatters:
+                if row[i] is not None:
+                    row[i] = fn(row[i])
+        return dict(zip(self.fields, row))
+
+    def rows(self, rows):
+        if self._formatters:
+            return [self.row(row) for row in rows]
+        fields = self.fields
+        return [dict(zip(fields, row)) for row in rows]
+
+    def one(self, obj):
+        """Objeto do ORM -> dicionário."""
+        return self.row(self._getter(obj))
+
+
+def _format_datetime(value):
+    return value.strftime('%d/%m/%Y %H:%M')
+
+
+products = Serializer({
+    'id': Product.id,
+    'name': Product.name,
+    'price': Product.price,
+    'description': Product.description,
+    'type': Product.type,
+    'image_url': Product.image_url,
+    'srcset': Product.image_srcset,
+    'video_url': Product.video_url,
+    'stock': Product.stock,
+})
+
+reviews = Serializer({
+    'id': Review.id,
+    'user_id': Review.user_id,
+    'user_name': User.name,
+    'comment': Review.comment,
+    'created_at': Review.created_at,
+}, formatters={'created_at': _format_datetime})
+
+product_images = Serializer({
+    'id': ProductImage.id,
+    'product_id': ProductImage.product_id,
+    'status': ProductImage.status,
+    'original_url': ProductImage.original_url,
+    'variants': ProductImage.variants,
+    'error': ProductImage.error,
+})
+
+tips = Serializer({'id': Tip.id, 'title': Tip.title, 'content': Tip.content, 'category': Tip.category})
+
+faqs = Serializer({'id': FAQ.id, 'question': FAQ.question, 'answer': FAQ.answer})
+
+social_media = Serializer({'id': SocialMedia.id, 'platform': SocialMedia.platform, 'url': SocialMedia.url})
+
+
+# ===================================
+# PROVIDER JSON COM ORJSON
+# ===================================
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Mesma saída do provider padrão do Flask (chaves ordenadas, datas em
+    formato HTTP), gerada pelo orjson direto em bytes. Única diferença: texto
+    não ASCII vai em UTF-8 em vez de escapes \\uXXXX."""
+
+    def _dumps(self, obj, indent=False, newline=False):
+        option = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        if newline:
+            option |= orjson.OPT_APPEND_NEWLINE
+        return orjson.dumps(obj, default=self.default, option=option)
+
+    def dumps(self, obj, **kwargs):
+        return self._dumps(obj, kwargs.get('indent')).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = self.compact is False or (self.compact is None and self._app.debug)
+        return self._app.response_class(self._dumps(obj, indent, newline=True), mimetype=self.mimetype)
+
+
+def init_app(app):
+    # FAST_JSON=0 força o json da biblioteca padrão mesmo com orjson instalado
+    app.config.setdefault('FAST_JSON', os.getenv('FAST_JSON', '1') != '0')
+    if orjson is not None and app.config['FAST_JSON']:
+        app.json = OrjsonProvider(app)
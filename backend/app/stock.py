@@ -0,0 +1,97 @@
+from sqlalchemy import select, update
+
+from . import db
+from .models import Product
+
+# ===================================
+# AJUSTES ATÔMICOS DE ESTOQUE
+# ===================================
+# Cada item vira um único UPDATE condicional:
+#   UPDATE products SET stock = stock + :delta WHERE id = :id AND stock + :delta >= 0
+# O banco aplica a conta sobre o valor atual da linha, então dois ajustes
+# simultâneos nunca se sobrescrevem e o estoque nunca fica negativo, sem
+# SELECT ... FOR UPDATE nem lock na aplicação. Linhas afetadas = 0 significa
+# estoque insuficiente (ou produto inexistente). O estoque resultante volta
+# no próprio UPDATE (RETURNING) ou, no MySQL, num SELECT da linha já travada.
+
+MAX_STOCK_ITEMS = 100
+
+
+class StockError(ValueError):
+    pass
+
+
+def parse_stock_items(data, field='delta', positive=False):
+    """Valida [{"product_id": 1, "<field>": n}, ...]; devolve lista de (product_id, n)."""
+    if not isinstance(data, dict):
+        raise StockError('o corpo deve ser um objeto JSON com items')
+    items = data.get('items')
+    if not isinstance(items, list) or not items:
+        raise StockError('items deve ser uma lista não vazia')
+    if len(items) > MAX_STOCK_ITEMS:
+        raise StockError(f'no máximo {MAX_STOCK_ITEMS} itens por requisição')
+
+    parsed = []
+    for index, item in enumerate(items):
+        if not isinstance(item, dict):
+            raise StockError(f'item {index}: deve ser um objeto')
+        product_id, amount = item.get('product_id'), item.get(field)
+        if isinstance(product_id, bool) or not isinstance(product_id, int):
+            raise StockError(f'item {index}: product_id deve ser um número inteiro')
+        if isinstance(amount, bool) or not isinstance(amount, int) or amount == 0:
+            raise StockError(f'item {index}: {field} deve ser um número inteiro diferente de zero')
+        if positive and amount < 0:
+            raise StockError(f'item {index}: {field} deve ser positivo')
+        parsed.append((product_id, amount))
+    return parsed
+
+
+def adjust_stock(product_id, delta):
+    """Aplica um delta de estoque; devolve o estoque resultante, ou None se a linha não foi atualizada."""
+    table = Product.__table__
+    statement = (
+        update(table)
+        .where(table.c.id == product_id, table.c.stock + delta >= 0)
+        .values(stock=table.c.stock + delta)
+    )
+    if db.engine.dialect.update_returning:
+        return db.session.execute(statement.returning(table.c.stock)).scalar_one_or_none()
+    if db.session.execute(statement).rowcount != 1:
+        return None
+    # Mesma transação: a linha continua travada pelo UPDATE e o valor lido é o gravado
+    return db.session.execute(select(table.c.stock).where(table.c.id == product_id)).scalar_one()
+
+
+def apply_stock_deltas(items, atomic=False):
+    """Aplica os deltas numa transação e devolve o resultado de cada item, na ordem recebida.
+
+    Os UPDATEs são emitidos em ordem de product_id para que requisições
+    concorrentes travem as linhas na mesma ordem (sem deadlock). Com
+    atomic=True, basta um item falhar para nada ser gravado.
+    """
+    applied = {}
+    for index in sorted(range(len(items)), key=lambda i: items[i][0]):
+        applied[index] = adjust_stock(*items[index])
+
+    failed_ids = {items[i][0] for i, stock in applied.items() if stock is None}
+    existing = set()
+    if failed_ids:
+        existing = set(db.session.execute(select(Product.id).where(Product.id.in_(failed_ids))).scalars())
+
+    rolled_back = atomic and bool(failed_ids)
+    if rolled_back:
+        db.session.rollback()
+    else:
+        db.session.commit()
+
+    results = []
+    for index, (product_id, delta) in enumerate(items):
+        result = {'product_id': product_id, 'delta': delta, 'ok': applied[index] is not None and not rolled_back}
+        if applied[index] is None:
+            result['error'] = 'estoque insuficiente' if product_id in existing else 'produto não encontrado'
+        elif rolled_back:
+            result['error'] = 'não aplicado: outro item falhou'
+        else:
+            result['stock'] = applied[index]
+        results.append(result)
+    return results
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""Benchmark: vazão de /login x p99 de /products sob carga mista
+(execute: python -m benchmarks.bench_login)
+
+Compara o hash de senha na thread da requisição (PASSWORD_HASH_WORKERS=0)
+com o pool de processos, usando threads para simular um worker com carga
+simultânea de logins e leituras do catálogo.
+"""
+
+import argparse
+import os
+import tempfile
+import threading
+import time
+
+from benchmarks.common import percentile
+from checks.common import make_app, print_header, print_info, print_success
+
+
+def seed(app, users, products):
+    from app import db
+    from app.hashing import password_hasher
+    from app.models import Product, User
+
+    with app.app_context():
+        password_hash = password_hasher.generate_password_hash('senha123')
+        db.session.add_all(
+            User(username=f'user{i}', email=f'user{i}@pifloor.com', password_hash=password_hash, name=f'User {i}')
+            for i in range(users))
+        db.session.add_all(
+            Product(name=f'Piso {i}', price=10.0 + i, type='laminado', stock=i) for i in range(products))
+        db.session.commit()
+
+
+def run(hash_workers, args):
+    os.environ['PASSWORD_HASH_WORKERS'] = str(hash_workers)
+    os.environ['BCRYPT_LOG_ROUNDS'] = str(args.rounds)
+    # Sem o cache de respostas, para medir o custo real de /products
+    os.environ['CATALOG_CACHE_SIZE'] = '0'
+    db_file = os.path.join(tempfile.mkdtemp(), 'bench_login.db')
+    app = make_app(f'sqlite:///{db_file}')
+    seed(app, args.login_threads, 200)
+
+    logins, busy, reads = [], [], []
+    stop = time.perf_counter() + args.duration
+
+    def login_loop(i):
+        client = app.test_client()
+        while time.perf_counter() < stop:
+            response = client.post('/login', json={'username': f'user{i}', 'password': 'senha123'})
+            (logins if response.status_code == 200 else busy).append(1)
+
+    def read_loop():
+        client = app.test_client()
+        while time.perf_counter() < stop:
+            start = time.perf_counter()
+            client.get('/products?limit=60')
+            reads.append(time.perf_counter() - start)
+
+    threads = [threading.Thread(target=login_loop, args=(i,)) for i in range(args.login_threads)]
+    threads += [threading.Thread(target=read_loop) for _ in range(args.reader_threads)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    return {
+        'logins_per_s': len(logins) / args.duration,
+        'rejected': len(busy),
+        'products_per_s': len(reads) / args.duration,
+        'products_p50_ms': percentile(reads, 50) * 1000,
+        'products_p99_ms': percentile(reads, 99) * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--duration', type=float, default=10)
+    parser.add_argument('--login-threads', type=int, default=4)
+    parser.add_argument('--reader-threads', type=int, default=4)
+    parser.add_argument('--rounds', type=int, default=12, help='BCRYPT_LOG_ROUNDS')
+    parser.add_argument('--workers', type=int, default=max(1, (os.cpu_count() or 2) // 2),
+                        help='PASSWORD_HASH_WORKERS do modo com pool')
+    args = parser.parse_args()
+
+    for label, hash_workers in (('Hash na thread da requisição', 0), (f'Pool de {args.workers} processos', args.workers)):
+        print_header(label)
+        result = run(hash_workers, args)
+        print_success(f"/login: {result['logins_per_s']:.1f} req/s ({result['rejected']} rejeitados com 503)")
+        print_success(f"/products: {result['products_per_s']:.1f} req/s")
+        print_info(f"/products p50 {result['products_p50_ms']:.1f} ms | p99 {result['products_p99_ms']:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
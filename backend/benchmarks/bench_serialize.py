@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""Microbenchmark: custo de serializar 10k produtos, antes e depois dos serializadores
+(execute: python -m benchmarks.bench_serialize)
+
+Antes: objetos do ORM + dicionário montado à mão + json da biblioteca padrão.
+Depois: tuplas só com as colunas + serializers.products + orjson (se instalado).
+Cada etapa (consulta, dicionários, JSON) é medida separadamente.
+"""
+
+import argparse
+import time
+
+from checks.common import make_app, print_header, print_info, print_success
+
+
+def best_of(repeat, fn):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--products', type=int, default=10000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    from sqlalchemy import insert
+
+    from app import db, serializers
+    from app.models import Product
+    from app.serializers import OrjsonProvider, orjson
+    from flask.json.provider import DefaultJSONProvider
+
+    app = make_app()
+    with app.app_context():
+        db.session.execute(insert(Product), [
+            {'name': f'Piso {i}', 'price': 10.0 + i, 'description': 'Piso laminado resistente a água',
+             'type': 'laminado', 'image_url': f'/static/p{i}.jpg', 'stock': i % 50}
+            for i in range(args.products)])
+        db.session.commit()
+
+        def orm_query():
+            db.session.expunge_all()
+            return Product.query.all()
+
+        def orm_dicts(items):
+            return [
+                {'id': p.id, 'name': p.name, 'price': p.price, 'description': p.description, 'type': p.type,
+                 'image_url': p.image_url, 'video_url': p.video_url, 'stock': p.stock}
+                for p in items]
+
+        def row_query():
+            return db.session.query(*serializers.products.columns).all()
+
+        stdlib = DefaultJSONProvider(app)
+        fast = OrjsonProvider(app) if orjson is not None else None
+
+        before_query, items = best_of(args.repeat, orm_query)
+        before_dicts, payload = best_of(args.repeat, lambda: orm_dicts(items))
+        before_json, _ = best_of(args.repeat, lambda: stdlib.response({'products': payload}))
+
+        after_query, rows = best_of(args.repeat, row_query)
+        after_dicts, payload = best_of(args.repeat, lambda: serializers.products.rows(rows))
+        after_json, _ = best_of(args.repeat, lambda: (fast or stdlib).response({'products': payload}))
+
+    scale = 10000 / args.products * 1000
+    print_header(f'Serialização de {args.products} produtos (ms por 10k)')
+    for label, before, after in (('consulta', before_query, after_query),
+                                 ('dicionários', before_dicts, after_dicts),
+                                 ('JSON', before_json, after_json)):
+        print_info(f'{label:12} antes {before * scale:8.1f} | depois {after * scale:8.1f}')
+    before = before_query + before_dicts + before_json
+    after = after_query + after_dicts + after_json
+    print_success(f'total: {before * scale:.1f} ms -> {after * scale:.1f} ms ({before / after:.1f}x)')
+    if fast is None:
+        print_info('orjson não instalado: o JSON "depois" usa a biblioteca padrão (pip install orjson)')
+
+
+if __name__ == "__main__":
+    main()
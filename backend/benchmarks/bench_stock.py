@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""Benchmark: compradores concorrentes disputando um único SKU
+(execute: python -m benchmarks.bench_stock)
+
+Várias threads compram 1 unidade do mesmo produto via
+POST /products/stock/decrement até o estoque acabar. Verifica que as vendas
+aceitas são exatamente o estoque inicial (sem overselling nem atualização
+perdida) e mede a vazão de baixas por segundo.
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+
+from benchmarks.common import latency_summary
+from checks.common import auth_header, make_app, print_error, print_header, print_info, print_success
+
+
+def seed(app, buyers, stock):
+    from app import db
+    from app.models import Product, User
+
+    with app.app_context():
+        db.session.add_all(
+            User(username=f'buyer{i}', email=f'buyer{i}@pifloor.com', password_hash='-', name=f'Buyer {i}')
+            for i in range(buyers))
+        product = Product(name='Piso Promoção', price=49.9, type='laminado', stock=stock)
+        db.session.add(product)
+        db.session.commit()
+        return product.id
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--database-uri', default=os.getenv('BENCH_DATABASE_URI'),
+                        help='banco usado (padrão: SQLite em arquivo temporário)')
+    parser.add_argument('--buyers', type=int, default=16)
+    parser.add_argument('--stock', type=int, default=2000)
+    args = parser.parse_args()
+
+    database_uri = args.database_uri or f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench_stock.db')}"
+    app = make_app(database_uri)
+    product_id = seed(app, args.buyers, args.stock)
+    headers = [auth_header(app, user_id) for user_id in range(1, args.buyers + 1)]
+
+    sold, rejected, errors, latencies = [], [], [], []
+    start_event = threading.Event()
+
+    def buyer(i):
+        client = app.test_client()
+        start_event.wait()
+        while True:
+            start = time.perf_counter()
+            response = client.post('/products/stock/decrement', headers=headers[i],
+                                   json={'items': [{'product_id': product_id, 'quantity': 1}]})
+            latencies.append(time.perf_counter() - start)
+            if response.status_code == 200:
+                sold.append(i)
+            elif response.status_code == 409:
+                rejected.append(i)
+                return
+            else:
+                errors.append(response.status_code)
+                return
+
+    print_header(f'{args.buyers} compradores, estoque {args.stock}')
+    threads = [threading.Thread(target=buyer, args=(i,)) for i in range(args.buyers)]
+    for thread in threads:
+        thread.start()
+    started = time.perf_counter()
+    start_event.set()
+    for thread in threads:
+        thread.join()
+    duration = time.perf_counter() - started
+
+    from app import db
+    from app.models import Product
+    with app.app_context():
+        final_stock = db.session.get(Product, product_id).stock
+
+    summary = latency_summary(latencies, duration)
+    print_info(f"{summary['count']} requisições em {duration:.2f}s | p50 {summary['p50_ms']} ms | p99 {summary['p99_ms']} ms")
+    print_success(f'{len(sold) / duration:.1f} baixas/s')
+
+    ok = True
+    if len(sold) == args.stock and final_stock == 0:
+        print_success(f'{len(sold)} vendas aceitas, estoque final 0 (sem overselling)')
+    else:
+        print_error(f'{len(sold)} vendas aceitas para estoque {args.stock}; estoque final {final_stock}')
+        ok = False
+    if errors:
+        print_error(f'{len(errors)} respostas inesperadas: {sorted(set(errors))}')
+        ok = False
+    print_info(f'{len(rejected)} compradores receberam 409 (estoque esgotado)')
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
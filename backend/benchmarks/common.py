@@ -0,0 +1,91 @@
+"""Utilidades compartilhadas pelos benchmarks"""
+
+import random
+from datetime import datetime, timedelta
+
+from sqlalchemy import insert
+
+PRODUCT_TYPES = ('laminado', 'vinilico', 'porcelanato', 'ceramica', 'madeira')
+WORDS = ('piso', 'carvalho', 'cinza', 'rustico', 'acetinado', 'polido', 'madeira', 'branco', 'nogueira', 'mármore')
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))]
+
+
+def latency_summary(latencies, duration):
+    return {
+        'count': len(latencies),
+        'rps': round(len(latencies) / duration, 2),
+        'p50_ms': round(percentile(latencies, 50) * 1000, 3),
+        'p95_ms': round(percentile(latencies, 95) * 1000, 3),
+        'p99_ms': round(percentile(latencies, 99) * 1000, 3),
+    }
+
+
+def _bulk_insert(model, rows, batch_size):
+    from app import db
+
+    for start in range(0, len(rows), batch_size):
+        db.session.execute(insert(model), rows[start:start + batch_size])
+        db.session.commit()
+
+
+def seed_catalog(app, products, users=None, reviews_per_product=2, favorites_per_user=20,
+                 password='senha123', batch_size=10000, seed=42):
+    """Catálogo sintético com usuários, avaliações e favoritos, inserido em lotes.
+
+    Retorna a quantidade de usuários criados (usernames user0..userN-1).
+    """
+    from app import db
+    from app.hashing import password_hasher
+    from app.models import Product, User, Review, Favorite, Tip, FAQ
+
+    rng = random.Random(seed)
+    users = users or max(10, products // 100)
+    with app.app_context():
+        password_hash = password_hasher.generate_password_hash(password)
+        _bulk_insert(User, [
+            {'username': f'user{i}', 'email': f'user{i}@pifloor.com', 'password_hash': password_hash,
+             'name': f'User {i}', 'is_admin': i == 0}
+            for i in range(users)], batch_size)
+
+        # Em lotes para não montar milhões de dicionários de uma vez
+        start = datetime(2025, 1, 1)
+        for offset in range(0, products, batch_size):
+            count = min(batch_size, products - offset)
+            product_rows, review_rows = [], []
+            for i in range(offset, offset + count):
+                ratings = [rng.randrange(1, 6) for _ in range(reviews_per_product)]
+                product_rows.append({
+                    'id': i + 1,
+                    'name': ' '.join(rng.choice(WORDS) for _ in range(3)).title(),
+                    'description': ' '.join(rng.choice(WORDS) for _ in range(20)),
+                    'price': round(rng.uniform(20, 400), 2),
+                    'type': rng.choice(PRODUCT_TYPES),
+                    'stock': rng.randrange(0, 200),
+                    'rating_sum': sum(ratings),
+                    'rating_count': len(ratings),
+                })
+                review_rows += [
+                    {'product_id': i + 1, 'user_id': rng.randrange(1, users + 1), 'rating': rating,
+                     'comment': 'Muito bom', 'created_at': start + timedelta(minutes=rng.randrange(10**6))}
+                    for rating in ratings]
+            _bulk_insert(Product, product_rows, batch_size)
+            _bulk_insert(Review, review_rows, batch_size)
+
+        favorite_rows = []
+        for user_id in range(1, users + 1):
+            for product_id in rng.sample(range(1, products + 1), min(favorites_per_user, products)):
+                favorite_rows.append({'user_id': user_id, 'product_id': product_id})
+        _bulk_insert(Favorite, favorite_rows, batch_size)
+
+        _bulk_insert(Tip, [{'title': f'Dica {i}', 'content': 'Limpe o piso com pano úmido.', 'category': 'limpeza'}
+                           for i in range(30)], batch_size)
+        _bulk_insert(FAQ, [{'question': f'Pergunta {i}?', 'answer': 'A garantia é de 10 anos.'}
+                           for i in range(30)], batch_size)
+        db.session.commit()
+    return users
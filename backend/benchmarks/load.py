@@ -0,0 +1,446 @@
+#!/usr/bin/env python3
+"""Benchmark de carga mista em todas as rotas do blueprint
+(execute: python -m benchmarks.load --size 1k)
+
+Monta a aplicação com create_app() sobre um banco local (SQLite temporário
+por padrão, ou BENCH_DATABASE_URI / --database-uri para um MySQL local),
+popula um catálogo sintético e dispara tráfego misto de leitura e escrita
+a partir de várias threads. Reporta vazão e p50/p95/p99 por rota e pode
+salvar/comparar um baseline em JSON.
+
+As imagens enviadas durante o benchmark vão para uma pasta temporária, não
+para app/static/media.
+"""
+
+import argparse
+import io
+import json
+import os
+import random
+import struct
+import sys
+import tempfile
+import threading
+import time
+import zlib
+from collections import defaultdict
+
+from benchmarks.common import latency_summary, seed_catalog
+from checks.common import make_app, print_header, print_success, print_error, print_info
+
+SIZES = {'1k': 1000, '10k': 10000, '100k': 100000, '1m': 1000000}
+SORTS = ('id', 'newest', 'price', 'price_desc', 'name')
+SEARCH_TERMS = ('piso', 'carvalho cinza', 'madeira polida', 'nogueira', 'mármore branco')
+BULK_NEW_ROWS = 20
+BULK_UPSERT_ROWS = 5
+# Quanto tempo cada cliente virtual insiste no /login antes de desistir
+LOGIN_TIMEOUT = 30
+
+
+def tiny_png(width=64, height=48):
+    """PNG RGB válido gerado sem Pillow, para o upload de imagens"""
+    def chunk(kind, data):
+        return struct.pack('>I', len(data)) + kind + data + struct.pack('>I', zlib.crc32(kind + data))
+    rows = b''.join(b'\x00' + b''.join(bytes((x * 4 % 256, y * 5 % 256, 128)) for x in range(width))
+                    for y in range(height))
+    return (b'\x89PNG\r\n\x1a\n' + chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0))
+            + chunk(b'IDAT', zlib.compress(rows)) + chunk(b'IEND', b''))
+
+
+PNG = tiny_png()
+
+
+class VirtualClient:
+    """Um cliente do site: usa o próprio usuário e, para as rotas admin, o admin (user0)"""
+
+    def __init__(self, app, index, products, users, rng):
+        from app.models import Review
+
+        self.client = app.test_client()
+        self.rng = rng
+        self.products = products
+        self.user_id = (index % (users - 1)) + 2
+        self.username = f'user{self.user_id - 1}'
+        self.user = self.login(self.username)
+        self.admin = self.login('user0')
+        self.cursors = {}
+        self.favorites = []
+        self.created_products = []
+        self.created_faqs = []
+        self.uploaded_images = []
+        with app.app_context():
+            self.own_reviews = [(r.product_id, r.id) for r in Review.query.filter_by(user_id=self.user_id).limit(100)]
+
+    def login(self, username):
+        # Todas as threads logam ao mesmo tempo: com poucos CPUs a fila do
+        # bcrypt enche e o /login responde 503 + Retry-After
+        deadline = time.perf_counter() + LOGIN_TIMEOUT
+        while True:
+            response = self.client.post('/login', json={'username': username, 'password': 'senha123'})
+            if response.status_code == 200:
+                return {'Authorization': f"Bearer {response.get_json()['token']}"}
+            if response.status_code != 503:
+                raise RuntimeError(f"/login de {username} respondeu {response.status_code}")
+            if time.perf_counter() > deadline:
+                raise RuntimeError(f"/login de {username} ainda respondia 503 após {LOGIN_TIMEOUT}s")
+            time.sleep(self.rng.uniform(0, 2 * int(response.headers.get('Retry-After', 1))) / 10)
+
+    def product_id(self):
+        return self.rng.randrange(1, self.products + 1)
+
+    # ---------- leituras ----------
+
+    def list_products(self):
+        params = {'sort': self.rng.choice(SORTS), 'limit': 60}
+        if self.rng.random() < 0.3:
+            params['type'] = self.rng.choice(('laminado', 'vinilico', 'porcelanato'))
+        if self.rng.random() < 0.5:
+            params['include'] = 'rating'
+        return self.client.get('/products', query_string=params)
+
+    def next_page(self):
+        sort = self.rng.choice(SORTS)
+        params = {'sort': sort, 'limit': 60}
+        if self.cursors.get(sort):
+            params['cursor'] = self.cursors[sort]
+        response = self.client.get('/products', query_string=params)
+        if response.status_code == 200:
+            self.cursors[sort] = response.get_json().get('next_cursor')
+        return response
+
+    def product(self):
+        return self.client.get(f'/products/{self.product_id()}')
+
+    def ratings(self):
+        ids = ','.join(str(self.product_id()) for _ in range(60))
+        return self.client.get(f'/products/ratings?ids={ids}')
+
+    def search(self):
+        return self.client.get('/search', query_string={'q': self.rng.choice(SEARCH_TERMS)})
+
+    def reviews(self):
+        return self.client.get(f'/products/{self.product_id()}/reviews')
+
+    def rating(self):
+        return self.client.get(f'/products/{self.product_id()}/rating')
+
+    def list_favorites(self):
+        return self.client.get('/favorites', headers=self.user)
+
+    def favorite_ids(self):
+        return self.client.get('/favorites/ids', headers=self.user)
+
+    # ---------- escritas ----------
+
+    def do_login(self):
+        return self.client.post('/login', json={'username': self.username, 'password': 'senha123'})
+
+    def create_user(self):
+        name = f'bench{threading.get_ident()}{self.rng.randrange(10**9)}'
+        return self.client.post('/users', json={'username': name, 'email': f'{name}@pifloor.com',
+                                                'password': 'senha123', 'name': name})
+
+    def add_favorite(self):
+        product_id = self.product_id()
+        response = self.client.post('/favorites', json={'product_id': product_id}, headers=self.user)
+        if response.status_code == 201:
+            self.favorites.append(product_id)
+        return response
+
+    def batch_favorites(self):
+        add = {self.product_id() for _ in range(5)} - set(self.favorites)
+        remove = [self.favorites.pop() for _ in range(min(3, len(self.favorites)))]
+        response = self.client.post('/favorites/batch', json={'add': sorted(add), 'remove': remove},
+                                    headers=self.user)
+        if response.status_code == 200:
+            self.favorites += sorted(add)
+        return response
+
+    def remove_favorite(self):
+        if not self.favorites:
+            return None
+        return self.client.delete(f'/favorites/{self.favorites.pop()}', headers=self.user)
+
+    def add_review(self):
+        return self.client.post(f'/products/{self.product_id()}/reviews',
+                                json={'user_id': self.user_id, 'comment': 'Gostei bastante'})
+
+    def rate(self):
+        return self.client.post(f'/products/{self.product_id()}/rating',
+                                json={'rating': self.rng.randrange(1, 6)}, headers=self.user)
+
+    def delete_review(self):
+        if not self.own_reviews:
+            return None
+        product_id, review_id = self.own_reviews.pop()
+        return self.client.delete(f'/products/{product_id}/reviews/{review_id}', headers=self.user)
+
+    def create_product(self):
+        response = self.client.post('/admin/products', headers=self.admin, json={
+            'name': 'Piso Benchmark', 'price': 99.9, 'stock': 10, 'type': 'laminado', 'description': 'teste'})
+        if response.status_code == 201:
+            self.created_products.append(response.get_json()['product']['id'])
+        return response
+
+    def update_product(self):
+        return self.client.put(f'/admin/products/{self.product_id()}', headers=self.admin,
+                               json={'stock': self.rng.randrange(0, 200)})
+
+    def delete_product(self):
+        if not self.created_products:
+            return None
+        return self.client.delete(f'/admin/products/{self.created_products.pop()}', headers=self.admin)
+
+    def create_tip(self):
+        return self.client.post('/admin/tips', headers=self.admin, json={'title': 'Dica', 'content': 'Conteúdo'})
+
+    def create_faq(self):
+        response = self.client.post('/admin/faqs', headers=self.admin, json={'question': 'Pergunta?', 'answer': 'Sim'})
+        if response.status_code == 200:
+            self.created_faqs.append(response.get_json()['faq']['id'])
+        return response
+
+    def delete_faq(self):
+        if not self.created_faqs:
+            return None
+        return self.client.delete(f'/admin/faqs/{self.created_faqs.pop()}', headers=self.admin)
+
+    def create_social_media(self):
+        return self.client.post('/admin/social-media', headers=self.admin,
+                                json={'platform': 'instagram', 'url': 'https://instagram.com/pifloor'})
+
+    def bulk_import(self):
+        rows = [{'name': f'Piso Lote {self.rng.randrange(10**6)}', 'price': 49.9, 'stock': 5, 'type': 'vinilico'}
+                for _ in range(BULK_NEW_ROWS)]
+        rows += [{'id': self.product_id(), 'name': f'Piso Atualizado {self.rng.randrange(10**6)}',
+                  'price': round(self.rng.uniform(20, 300), 2)} for _ in range(BULK_UPSERT_ROWS)]
+        body = '\n'.join(json.dumps(row) for row in rows)
+        return self.client.post('/admin/products/bulk', data=body,
+                                headers={**self.admin, 'Content-Type': 'application/x-ndjson'})
+
+    def adjust_stock(self):
+        items = [{'product_id': self.product_id(), 'delta': self.rng.choice((-2, -1, 1, 5))} for _ in range(5)]
+        return self.client.post('/admin/products/stock', headers=self.admin, json={'items': items})
+
+    def decrement_stock(self):
+        items = [{'product_id': self.product_id(), 'quantity': 1} for _ in range(self.rng.randrange(1, 4))]
+        return self.client.post('/products/stock/decrement', headers=self.user, json={'items': items})
+
+    def export_catalog(self):
+        response = self.client.get('/products/export', headers=self.admin,
+                                   query_string={'format': self.rng.choice(('ndjson', 'csv'))})
+        # A latência inclui consumir o corpo inteiro do streaming
+        response.get_data()
+        return response
+
+    def upload_image(self):
+        response = self.client.post(f'/admin/products/{self.product_id()}/image', headers=self.admin,
+                                    data={'image': (io.BytesIO(PNG), 'piso.png')},
+                                    content_type='multipart/form-data')
+        if response.status_code == 202:
+            self.uploaded_images.append(response.get_json()['image']['id'])
+        return response
+
+    def image_status(self):
+        if not self.uploaded_images:
+            return None
+        return self.client.get(f'/admin/images/{self.rng.choice(self.uploaded_images)}', headers=self.admin)
+
+    def cache_stats(self):
+        return self.client.get('/admin/cache', headers=self.admin)
+
+    def pool_stats(self):
+        return self.client.get('/admin/pool', headers=self.admin)
+
+
+# (rota, peso, método do VirtualClient) — leitura domina, como no site
+TRAFFIC_MIX = [
+    ('GET /products', 20, 'list_products'),
+    ('GET /products (cursor)', 6, 'next_page'),
+    ('GET /products/<id>', 10, 'product'),
+    ('GET /products/ratings', 5, 'ratings'),
+    ('GET /tips', 4, lambda c: c.client.get('/tips')),
+    ('GET /faqs', 4, lambda c: c.client.get('/faqs')),
+    ('GET /search', 5, 'search'),
+    ('GET /products/<id>/reviews', 8, 'reviews'),
+    ('GET /products/<id>/rating', 4, 'rating'),
+    ('GET /favorites', 5, 'list_favorites'),
+    ('GET /favorites/ids', 5, 'favorite_ids'),
+    ('POST /login', 2, 'do_login'),
+    ('POST /users', 0.5, 'create_user'),
+    ('POST /favorites', 2, 'add_favorite'),
+    ('DELETE /favorites/<id>', 1.5, 'remove_favorite'),
+    ('POST /favorites/batch', 0.5, 'batch_favorites'),
+    ('POST /products/<id>/reviews', 1.5, 'add_review'),
+    ('POST /products/<id>/rating', 2, 'rate'),
+    ('DELETE /products/<id>/reviews/<id>', 0.5, 'delete_review'),
+    ('POST /admin/products', 0.5, 'create_product'),
+    ('PUT /admin/products/<id>', 0.5, 'update_product'),
+    ('DELETE /admin/products/<id>', 0.4, 'delete_product'),
+    ('POST /admin/tips', 0.2, 'create_tip'),
+    ('POST /admin/faqs', 0.2, 'create_faq'),
+    ('DELETE /admin/faqs/<id>', 0.2, 'delete_faq'),
+    ('POST /admin/social-media', 0.1, 'create_social_media'),
+    ('GET /admin/cache', 0.1, 'cache_stats'),
+    ('GET /admin/pool', 0.1, 'pool_stats'),
+    ('POST /admin/products/bulk', 0.1, 'bulk_import'),
+    ('POST /admin/products/stock', 0.3, 'adjust_stock'),
+    ('POST /products/stock/decrement', 1, 'decrement_stock'),
+    ('GET /products/export', 0.02, 'export_catalog'),
+    ('POST /admin/products/<id>/image', 0.1, 'upload_image'),
+    ('GET /admin/images/<id>', 0.1, 'image_status'),
+    ('GET /healthz', 1, lambda c: c.client.get('/healthz')),
+    ('GET /readyz', 1, lambda c: c.client.get('/readyz')),
+]
+
+
+def run_traffic(app, products, users, threads, duration, seed):
+    latencies = defaultdict(list)
+    errors = defaultdict(int)
+    labels = [label for label, _, _ in TRAFFIC_MIX]
+    weights = [weight for _, weight, _ in TRAFFIC_MIX]
+    actions = {label: action for label, _, action in TRAFFIC_MIX}
+    lock = threading.Lock()
+    start_barrier = threading.Barrier(threads + 1)
+
+    setup_errors = []
+
+    def worker(index):
+        rng = random.Random(seed + index)
+        try:
+            client = VirtualClient(app, index, products, users, rng)
+        except Exception as e:
+            # Libera as outras threads e o início do benchmark, que então falha
+            setup_errors.append(e)
+            start_barrier.abort()
+            return
+        local_latencies, local_errors = defaultdict(list), defaultdict(int)
+        try:
+            start_barrier.wait()
+        except threading.BrokenBarrierError:
+            return
+        stop = time.perf_counter() + duration
+        while time.perf_counter() < stop:
+            label = rng.choices(labels, weights)[0]
+            action = actions[label]
+            started = time.perf_counter()
+            response = action(client) if callable(action) else getattr(client, action)()
+            if response is None:
+                continue
+            local_latencies[label].append(time.perf_counter() - started)
+            if response.status_code >= 500:
+                local_errors[label] += 1
+        with lock:
+            for label, values in local_latencies.items():
+                latencies[label] += values
+            for label, count in local_errors.items():
+                errors[label] += count
+
+    workers = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    for thread in workers:
+        thread.start()
+    try:
+        start_barrier.wait()
+    except threading.BrokenBarrierError:
+        pass
+    for thread in workers:
+        thread.join()
+    if setup_errors:
+        raise RuntimeError(f"{len(setup_errors)} cliente(s) não conseguiram começar: {setup_errors[0]}")
+
+    report = {}
+    for label in labels:
+        if latencies[label]:
+            report[label] = latency_summary(latencies[label], duration)
+            report[label]['errors'] = errors[label]
+    return report
+
+
+def compare(report, baseline, tolerance, min_samples):
+    """Rotas cujo p95 piorou mais que a tolerância em relação ao baseline"""
+    regressions = []
+    for label, current in report.items():
+        previous = baseline.get('routes', {}).get(label)
+        # Rotas com poucas amostras têm p95 instável demais para comparar
+        if not previous or min(previous['count'], current['count']) < min_samples:
+            continue
+        limit = previous['p95_ms'] * (1 + tolerance)
+        # Ignora variações de fração de milissegundo em rotas muito rápidas
+        if current['p95_ms'] > limit and current['p95_ms'] - previous['p95_ms'] > 1:
+            regressions.append((label, previous['p95_ms'], current['p95_ms']))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--size', default='1k', help=f"produtos no catálogo: {', '.join(SIZES)} ou um número")
+    parser.add_argument('--database-uri', default=os.getenv('BENCH_DATABASE_URI'),
+                        help='banco vazio para o benchmark (padrão: SQLite temporário)')
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--duration', type=float, default=30, help='segundos de tráfego')
+    parser.add_argument('--rounds', type=int, default=12, help='BCRYPT_LOG_ROUNDS')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--save-baseline', help='grava o resultado neste arquivo JSON')
+    parser.add_argument('--baseline', help='compara com um resultado JSON salvo anteriormente')
+    parser.add_argument('--tolerance', type=float, default=0.2, help='piora aceitável do p95 (0.2 = 20%%)')
+    parser.add_argument('--min-samples', type=int, default=30, help='amostras mínimas por rota para comparar')
+    args = parser.parse_args()
+
+    products = SIZES.get(args.size.lower()) or int(args.size)
+    os.environ['BCRYPT_LOG_ROUNDS'] = str(args.rounds)
+    database_uri = args.database_uri or f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}"
+
+    print_header(f"CATÁLOGO COM {products} PRODUTOS")
+    app = make_app(database_uri)
+    # Erros viram respostas 500 contabilizadas, em vez de exceções nas threads
+    app.config['TESTING'] = False
+    started = time.perf_counter()
+    users = seed_catalog(app, products)
+    print_info(f"Banco populado em {time.perf_counter() - started:.1f}s ({users} usuários)")
+    app.static_folder = tempfile.mkdtemp()
+    # Como em produção (post_worker_init): o /readyz só responde 200 depois do aquecimento
+    from app import health
+    health.warm_up(app)
+
+    print_header(f"TRÁFEGO MISTO: {args.threads} THREADS x {args.duration:.0f}s")
+    try:
+        report = run_traffic(app, products, users, args.threads, args.duration, args.seed)
+    except RuntimeError as e:
+        print_error(str(e))
+        return 1
+    print(f"{'rota':<38}{'req':>7}{'req/s':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'erros':>7}")
+    for label, row in report.items():
+        print(f"{label:<38}{row['count']:>7}{row['rps']:>9.1f}{row['p50_ms']:>9.2f}"
+              f"{row['p95_ms']:>9.2f}{row['p99_ms']:>9.2f}{row['errors']:>7}")
+    total = sum(row['count'] for row in report.values())
+    print_success(f"Total: {total} requisições, {total / args.duration:.1f} req/s")
+
+    result = {
+        'meta': {'products': products, 'users': users, 'threads': args.threads, 'duration': args.duration,
+                 'database': database_uri.split(':', 1)[0], 'rounds': args.rounds},
+        'routes': report,
+    }
+    if args.save_baseline:
+        with open(args.save_baseline, 'w', encoding='utf-8') as f:
+            json.dump(result, f, indent=2, ensure_ascii=False)
+        print_info(f"Baseline salvo em {args.save_baseline}")
+
+    failed = any(row['errors'] for row in report.values())
+    if failed:
+        print_error("Houve respostas 5xx durante o benchmark")
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+        print_header("COMPARAÇÃO COM O BASELINE")
+        regressions = compare(report, baseline, args.tolerance, args.min_samples)
+        for label, before, after in regressions:
+            print_error(f"{label}: p95 {before:.2f} ms -> {after:.2f} ms")
+        if regressions:
+            failed = True
+        else:
+            print_success(f"Nenhuma rota piorou mais de {args.tolerance:.0%} no p95")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""Verifica a quantidade de consultas SQL por rota (execute: python -m checks.check_queries)
+
+Com TESTING ligado, qualquer rota que passe do seu @query_budget levanta
+QueryBudgetExceeded; aqui cada rota do blueprint é exercitada uma vez.
+"""
+
+import sys
+
+from checks.common import make_app, auth_header, count_queries, print_header, print_success, print_error
+
+
+def seed(app, favorites=200):
+    from app import db
+    from app.hashing import password_hasher
+    from app.models import Product, User, Favorite, Review, Tip, FAQ
+
+    with app.app_context():
+        password_hash = password_hasher.generate_password_hash('senha123')
+        user = User(username='cliente', email='cliente@pifloor.com', password_hash=password_hash, name='Cliente')
+        admin = User(username='admin', email='admin@pifloor.com', password_hash=password_hash, name='Admin', is_admin=True)
+        db.session.add_all([user, admin])
+        products = [Product(name=f'Piso {i}', price=10.0 + i, type='laminado', stock=i) for i in range(favorites + 10)]
+        db.session.add_all(products)
+        db.session.add_all([Tip(title='Dica', content='...'), FAQ(question='Pergunta?', answer='...')])
+        db.session.flush()
+        db.session.add_all(Favorite(user_id=user.id, product_id=p.id) for p in products[:favorites])
+        db.session.add(Review(product_id=1, user_id=admin.id, rating=5, comment='Ótimo'))
+        db.session.commit()
+        return user.id, admin.id
+
+
+def check_favorites(app, client, user_id):
+    """GET /favorites deve custar um número constante de consultas, independente da quantidade de favoritos"""
+    print_header("GET /favorites")
+    headers = auth_header(app, user_id)
+    ok = True
+    counts = set()
+    for limit in (1, 50, 200):
+        with count_queries(app) as statements:
+            response = client.get(f'/favorites?limit={limit}', headers=headers)
+        total = len(response.get_json()['favorites'])
+        counts.add(len(statements))
+        if response.status_code == 200 and total == limit:
+            print_success(f"limit={limit}: {total} favoritos em {len(statements)} consultas")
+        else:
+            print_error(f"limit={limit}: status {response.status_code}, {total} favoritos em {len(statements)} consultas")
+            ok = False
+    if len(counts) > 1:
+        print_error(f"quantidade de consultas varia com o tamanho da página: {sorted(counts)}")
+        ok = False
+    return ok
+
+
+def check_admin_access(app, client, user_id):
+    """Rotas admin sem token ou com token de cliente devem responder 403"""
+    print_header("ACESSO ÀS ROTAS ADMIN")
+    user = auth_header(app, user_id)
+    calls = [
+        ('POST', '/admin/products', {'name': 'Sem token', 'price': 1}, None),
+        ('PUT', '/admin/products/1', {'price': 1}, None),
+        ('POST', '/admin/products', {'name': 'Cliente', 'price': 1}, user),
+        ('PUT', '/admin/products/1', {'price': 1}, user),
+    ]
+    ok = True
+    for method, url, body, headers in calls:
+        response = client.open(url, method=method, json=body, headers=headers)
+        who = 'cliente' if headers else 'sem token'
+        if response.status_code == 403:
+            print_success(f"{method} {url} ({who}): 403")
+        else:
+            print_error(f"{method} {url} ({who}): status {response.status_code}, esperado 403")
+            ok = False
+    return ok
+
+
+def check_budgets(app, client, user_id, admin_id):
+    """Exercita as rotas com @query_budget; estourar o orçamento levanta QueryBudgetExceeded"""
+    from app.budgets import QueryBudgetExceeded
+
+    print_header("ORÇAMENTO POR ROTA")
+    user = auth_header(app, user_id)
+    admin = auth_header(app, admin_id)
+    calls = [
+        ('GET', '/products?include=rating', None, None),
+        ('GET', '/products/ratings?ids=1,2,3', None, None),
+        ('GET', '/products/1', None, None),
+        ('GET', '/tips', None, None),
+        ('GET', '/faqs', None, None),
+        ('POST', '/users', {'username': 'novo', 'email': 'novo@pifloor.com', 'password': 'x', 'name': 'Novo'}, None),
+        ('POST', '/login', {'username': 'cliente', 'password': 'senha123'}, None),
+        ('POST', '/admin/products', {'name': 'Piso novo', 'price': 10}, admin),
+        ('PUT', '/admin/products/1', {'price': 12}, admin),
+        ('POST', '/admin/tips', {'title': 'Dica 2', 'content': '...'}, admin),
+        ('POST', '/admin/faqs', {'question': 'Outra?', 'answer': '...'}, admin),
+        ('DELETE', '/admin/faqs/1', None, admin),
+        ('POST', '/admin/social-media', {'platform': 'instagram', 'url': 'https://instagram.com'}, admin),
+        ('GET', '/favorites', None, user),
+        ('POST', '/favorites', {'product_id': 205}, user),
+        ('DELETE', '/favorites/205', None, user),
+        ('GET', '/favorites/ids', None, user),
+        ('POST', '/favorites/batch', {'add': [205, 206], 'remove': [1, 2]}, user),
+        ('GET', '/products/1/reviews', None, None),
+        ('POST', '/products/1/reviews', {'user_id': user_id, 'comment': 'Bom'}, None),
+        ('POST', '/products/1/rating', {'rating': 4}, user),
+        ('GET', '/products/1/rating', None, None),
+        ('DELETE', '/products/1/reviews/1', None, admin),
+        ('DELETE', '/admin/products/209', None, admin),
+    ]
+    ok = True
+    for method, url, body, headers in calls:
+        try:
+            with count_queries(app) as statements:
+                response = client.open(url, method=method, json=body, headers=headers)
+        except QueryBudgetExceeded as e:
+            print_error(str(e))
+            ok = False
+            continue
+        if response.status_code >= 400:
+            print_error(f"{method} {url}: status {response.status_code}")
+            ok = False
+        else:
+            print_success(f"{method} {url}: {len(statements)} consultas")
+    return ok
+
+
+def check_bulk_import(app, client, admin_id):
+    """Lote misto (sem id, id novo e id existente) deve gravar cada linha com o id certo"""
+    from app import db
+    from app.models import Product
+
+    print_header("IMPORTAÇÃO EM LOTE")
+    body = '\n'.join([
+        '{"name": "Lote sem id", "price": 1}',
+        # Com todas as colunas, a linha com id novo cai no mesmo formato da linha sem id
+        '{"id": 999, "name": "Lote id novo", "description": null, "price": 2, "type": null,'
+        ' "image_url": null, "video_url": null, "stock": 0}',
+        '{"id": 3, "price": 30}',
+    ])
+    response = client.post('/admin/products/bulk', data=body, headers={
+        **auth_header(app, admin_id), 'Content-Type': 'application/x-ndjson'})
+    report = response.get_json()
+    with app.app_context():
+        new_id = Product.query.filter_by(name='Lote id novo').one().id
+        without_id = Product.query.filter_by(name='Lote sem id').count()
+        updated = db.session.get(Product, 3)
+        expected = [
+            ('status 200, 1 criado e 2 upserts', (response.status_code, report['created'], report['upserted']) == (200, 1, 2)),
+            ('id informado mantido (999)', new_id == 999),
+            ('produto sem id criado', without_id == 1),
+            ('upsert altera só o preço', (updated.name, updated.price) == ('Piso 2', 30)),
+        ]
+    ok = True
+    for description, passed in expected:
+        (print_success if passed else print_error)(description)
+        ok = ok and passed
+    return ok
+
+
+def main():
+    app = make_app()
+    user_id, admin_id = seed(app)
+    client = app.test_client()
+
+    results = [
+        ("GET /favorites", check_favorites(app, client, user_id)),
+        ("Acesso admin", check_admin_access(app, client, user_id)),
+        ("Orçamento por rota", check_budgets(app, client, user_id, admin_id)),
+        ("Importação em lote", check_bulk_import(app, client, admin_id)),
+    ]
+
+    print_header("RESUMO")
+    for name, result in results:
+        (print_success if result else print_error)(f"{name}: {'PASSOU' if result else 'FALHOU'}")
+    return 0 if all(result for _, result in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
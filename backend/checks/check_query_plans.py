@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""Roda EXPLAIN nas consultas de cada rota e falha em full table scans
+(execute: python -m checks.check_query_plans)
+
+O schema é criado pelas migrations, então a verificação também garante que
+os índices necessários estão nelas. Por padrão usa um SQLite temporário;
+para checar o MySQL, aponte CHECK_DATABASE_URI para um banco vazio.
+"""
+
+import os
+import random
+import sys
+import tempfile
+from datetime import datetime, timedelta
+
+from sqlalchemy import event, text
+
+from checks.common import make_app, auth_header, print_header, print_success, print_error, print_info
+
+# (rota, método, corpo, aceita full scan?) — /tips e /faqs listam a tabela inteira de propósito
+ROUTES = [
+    ('/products', 'GET', None, False),
+    ('/products?sort=price&limit=20', 'GET', None, False),
+    ('/products?sort=price_desc&limit=20', 'GET', None, False),
+    ('/products?sort=name&limit=20', 'GET', None, False),
+    ('/products?sort=newest&limit=20', 'GET', None, False),
+    ('/products?type=vinilico&sort=price&limit=20', 'GET', None, False),
+    ('/products?type=vinilico&sort=name&limit=20', 'GET', None, False),
+    ('/products?include=rating&limit=20', 'GET', None, False),
+    ('/products/42', 'GET', None, False),
+    ('/products/ratings?ids=1,2,3,4,5', 'GET', None, False),
+    ('/products/42/rating', 'GET', None, False),
+    ('/products/42/reviews', 'GET', None, False),
+    ('/favorites', 'GET', None, False),
+    ('/products/42/rating', 'POST', {'rating': 4}, False),
+    ('/login', 'POST', {'username': 'user7', 'password': 'senha123'}, False),
+    ('/tips', 'GET', None, True),
+    ('/faqs', 'GET', None, True),
+]
+
+
+def seed(app, products=3000, users=200, reviews=20000, favorites=5000):
+    from app import db
+    from app.hashing import password_hasher
+    from app.models import Product, User, Review, Tip, FAQ, Favorite
+
+    rng = random.Random(42)
+    with app.app_context():
+        password_hash = password_hasher.generate_password_hash('senha123')
+        db.session.add_all(
+            User(username=f'user{i}', email=f'user{i}@pifloor.com', password_hash=password_hash, name=f'User {i}')
+            for i in range(users))
+        db.session.add_all(
+            Product(name=f'Piso {rng.randrange(10**6)}', price=round(rng.uniform(20, 400), 2),
+                    type=rng.choice(['laminado', 'vinilico', 'porcelanato']), stock=rng.randrange(100))
+            for _ in range(products))
+        db.session.add_all(Tip(title=f'Dica {i}', content='...', category='limpeza') for i in range(20))
+        db.session.add_all(FAQ(question=f'Pergunta {i}?', answer='...') for i in range(20))
+        db.session.flush()
+        start = datetime(2025, 1, 1)
+        db.session.add_all(
+            Review(product_id=rng.randrange(1, products + 1), user_id=rng.randrange(1, users + 1),
+                   rating=rng.randrange(1, 6), comment='ok', created_at=start + timedelta(minutes=i))
+            for i in range(reviews))
+        pairs = {(rng.randrange(1, users + 1), rng.randrange(1, products + 1)) for _ in range(favorites)}
+        db.session.add_all(Favorite(user_id=u, product_id=p) for u, p in pairs)
+        db.session.commit()
+        if db.engine.dialect.name == 'sqlite':
+            db.session.execute(text('ANALYZE'))
+        else:
+            for table in ('products', 'users', 'reviews', 'favorites'):
+                db.session.execute(text(f'ANALYZE TABLE {table}'))
+        db.session.commit()
+
+
+def explain(connection, statement, parameters):
+    """Retorna a lista de problemas encontrados no plano da consulta"""
+    if connection.dialect.name == 'sqlite':
+        rows = connection.exec_driver_sql(f'EXPLAIN QUERY PLAN {statement}', parameters).fetchall()
+        details = [row[-1] for row in rows]
+        # "SCAN tabela" sem índice = leitura da tabela inteira. Com LIMIT e sem
+        # ordenação em B-tree temporária o SQLite para cedo, então é aceitável.
+        stops_early = ' LIMIT ' in statement.upper() and not any('TEMP B-TREE' in d for d in details)
+        problems = [d for d in details if d.startswith('SCAN') and ' INDEX ' not in f'{d} ' and not stops_early]
+        problems += [d for d in details if 'TEMP B-TREE FOR ORDER BY' in d]
+        return problems, details
+    rows = connection.exec_driver_sql(f'EXPLAIN {statement}', parameters).mappings().fetchall()
+    details = [f"{row['table']}: type={row['type']} key={row['key']} extra={row['Extra']}" for row in rows]
+    problems = [d for d, row in zip(details, rows)
+                if row['type'] == 'ALL' or 'Using filesort' in (row['Extra'] or '')]
+    return problems, details
+
+
+def main():
+    database_uri = os.getenv('CHECK_DATABASE_URI') or f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'plans.db')}"
+    app = make_app(database_uri, migrate=True)
+    seed(app)
+    client = app.test_client()
+    headers = auth_header(app, 8)
+
+    from app import db
+    with app.app_context():
+        engine = db.engine
+
+    failures = 0
+    for url, method, body, allow_full_scan in ROUTES:
+        captured = []
+
+        def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            if statement.lstrip().upper().startswith('SELECT'):
+                captured.append((statement, parameters))
+
+        event.listen(engine, 'before_cursor_execute', before_cursor_execute)
+        try:
+            response = client.open(url, method=method, json=body, headers=headers)
+        finally:
+            event.remove(engine, 'before_cursor_execute', before_cursor_execute)
+
+        print_header(f'{method} {url}')
+        if response.status_code >= 500:
+            print_error(f'status {response.status_code}')
+            failures += 1
+            continue
+        with engine.connect() as connection:
+            for statement, parameters in captured:
+                problems, details = explain(connection, statement, parameters)
+                first_line = ' '.join(statement.split())[:90]
+                if problems and not allow_full_scan:
+                    failures += 1
+                    print_error(first_line)
+                    for detail in details:
+                        print_info(detail)
+                else:
+                    print_success(f"{first_line} [{'; '.join(details)}]")
+
+    print_header("RESUMO")
+    if failures:
+        print_error(f'{failures} consultas com full table scan')
+        return 1
+    print_success('Nenhuma consulta com full table scan')
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
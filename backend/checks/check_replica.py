@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""Verificação: roteamento das leituras para a réplica (execute: python -m checks.check_replica)
+
+Usa dois bancos SQLite independentes como principal e réplica. O mesmo
+produto tem nomes diferentes em cada um, então a resposta mostra de onde
+veio a leitura.
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+from sqlalchemy import event
+
+from checks.common import auth_header, make_app, print_error, print_header, print_info, print_success
+
+STICKY_SECONDS = 1.0
+
+
+def seed(app):
+    from app import db
+    from app.models import Product, User
+
+    with app.app_context():
+        replica = db.engines['replica']
+        db.metadata.create_all(replica)
+        admin = User(username='admin', email='admin@pifloor.com', password_hash='-', name='Admin', is_admin=True)
+        db.session.add(admin)
+        db.session.add(Product(name='Piso principal', price=10.0, type='laminado', stock=5))
+        db.session.commit()
+        with replica.begin() as connection:
+            connection.execute(User.__table__.insert(), [{'id': admin.id, 'username': 'admin', 'email': 'a@a',
+                                                          'password_hash': '-', 'name': 'Admin', 'is_admin': True}])
+            connection.execute(Product.__table__.insert(), [{'id': 1, 'name': 'Piso réplica', 'price': 10.0,
+                                                             'type': 'laminado', 'stock': 5}])
+        return admin.id
+
+
+def main():
+    directory = tempfile.mkdtemp()
+    os.environ['SQLALCHEMY_REPLICA_URI'] = f"sqlite:///{os.path.join(directory, 'replica.db')}"
+    os.environ['REPLICA_STICKY_SECONDS'] = str(STICKY_SECONDS)
+    # Com o cache de respostas ligado, como em produção
+    app = make_app(f"sqlite:///{os.path.join(directory, 'primary.db')}")
+    admin_id = seed(app)
+    admin = auth_header(app, admin_id)
+
+    from app import db
+    from app.cache import response_cache
+    with app.app_context():
+        engines = {'principal': db.engines[None], 'réplica': db.engines['replica']}
+    executed = []
+    for name, engine in engines.items():
+        event.listen(engine, 'before_cursor_execute',
+                     lambda conn, cursor, statement, *args, name=name: executed.append((name, statement)))
+
+    def product_name(client, path='/products/1', **headers):
+        return client.get(path, headers=headers).get_json()['name']
+
+    print_header("LEITURAS NA RÉPLICA")
+    checks = []
+
+    reader = app.test_client()
+    first = reader.get('/products/1')
+    etag = first.headers['ETag']
+    checks.append(('GET /products/1 vai para a réplica', first.get_json()['name'] == 'Piso réplica'))
+
+    writer = app.test_client()
+    del executed[:]
+    response = writer.put('/admin/products/1', json={'name': 'Piso editado'}, headers=admin)
+    checks.append(('PUT /admin/products/1 só usa o principal',
+                   response.status_code == 200 and {name for name, _ in executed} == {'principal'}))
+    checks.append(('escrita devolve o cookie de leitura no principal',
+                   'read_primary_until' in response.headers.get('Set-Cookie', '')))
+    checks.append(('quem escreveu lê o próprio dado logo em seguida', product_name(writer) == 'Piso editado'))
+
+    del executed[:]
+    cached_before = response_cache.stats()['size']
+    checks.append(('os demais clientes continuam na réplica logo após a escrita',
+                   product_name(app.test_client()) == 'Piso réplica'
+                   and {name for name, _ in executed} == {'réplica'}))
+    checks.append(('leitura da réplica logo após a escrita não entra no cache',
+                   response_cache.stats()['size'] == cached_before))
+
+    # Escrita feita em outro worker: este processo não invalidou o cache nem o
+    # ETag, e o cliente só traz o cookie que o outro worker devolveu
+    time.sleep(STICKY_SECONDS + 0.2)
+    with engines['principal'].begin() as connection:
+        connection.exec_driver_sql("UPDATE products SET name = 'Piso de outro worker' WHERE id = 1")
+    product_name(app.test_client())  # coloca a versão da réplica no cache
+    other_writer = app.test_client()
+    other_writer.set_cookie('read_primary_until', f'{time.time() + STICKY_SECONDS:.3f}')
+    checks.append(('com o cookie, quem escreveu em outro worker não recebe o corpo do cache',
+                   product_name(other_writer) == 'Piso de outro worker'))
+    checks.append(('com o cookie, If-None-Match antigo não vira 304',
+                   other_writer.get('/products/1', headers={'If-None-Match': etag}).status_code == 200))
+    checks.append(('sem o cookie, os demais clientes seguem no cache e na réplica',
+                   product_name(app.test_client()) == 'Piso réplica'))
+
+    time.sleep(STICKY_SECONDS + 0.2)
+    del executed[:]
+    checks.append(('depois da janela quem escreveu volta para a réplica',
+                   product_name(other_writer, '/products/1?depois=1') == 'Piso réplica'
+                   and {name for name, _ in executed} == {'réplica'}))
+
+    del executed[:]
+    app.test_client().get('/favorites', headers=admin)
+    checks.append(('rotas sem @replica_read ficam no principal', {name for name, _ in executed} == {'principal'}))
+
+    ok = True
+    for label, passed in checks:
+        (print_success if passed else print_error)(label)
+        ok = ok and passed
+    print_info(f'bancos em {directory}')
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
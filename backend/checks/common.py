@@ -0,0 +1,76 @@
+"""Utilidades compartilhadas pelos scripts de verificação do backend"""
+
+import os
+from contextlib import contextmanager
+
+from colorama import init, Fore, Style
+from sqlalchemy import event
+
+# Inicializar colorama para Windows
+init(autoreset=True)
+
+
+def make_app(database_uri=None, migrate=False):
+    """Cria a aplicação via create_app() com um banco local (SQLite em memória por padrão)
+
+    Com migrate=True o schema vem das migrations (flask db upgrade) em vez de db.create_all().
+    """
+    os.environ['SQLALCHEMY_DATABASE_URI'] = database_uri or os.getenv('CHECK_DATABASE_URI', 'sqlite://')
+
+    from app import create_app, db
+
+    app = create_app()
+    app.config['TESTING'] = True
+    with app.app_context():
+        if migrate:
+            from flask_migrate import upgrade
+            upgrade(directory=os.path.join(os.path.dirname(os.path.dirname(__file__)), 'migrations'))
+        else:
+            db.create_all()
+    return app
+
+
+def auth_header(app, user_id):
+    """Token igual ao emitido pelo /login (com as claims de identidade)"""
+    from flask_jwt_extended import create_access_token
+    from app.auth import identity_claims
+    from app.models import User
+
+    with app.app_context():
+        user = User.query.get(user_id)
+        token = create_access_token(identity=str(user_id), additional_claims=identity_claims(user))
+    return {'Authorization': f'Bearer {token}'}
+
+
+@contextmanager
+def count_queries(app):
+    """Conta os statements SQL executados dentro do bloco"""
+    from app import db
+
+    with app.app_context():
+        engine = db.engine
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, 'before_cursor_execute', before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, 'before_cursor_execute', before_cursor_execute)
+
+
+def print_header(text):
+    print(f"\n{Fore.CYAN}{'='*50}")
+    print(f"{Fore.CYAN}{text.center(50)}")
+    print(f"{Fore.CYAN}{'='*50}{Style.RESET_ALL}\n")
+
+def print_success(text):
+    print(f"{Fore.GREEN}✓ {text}{Style.RESET_ALL}")
+
+def print_error(text):
+    print(f"{Fore.RED}✗ {text}{Style.RESET_ALL}")
+
+def print_info(text):
+    print(f"{Fore.YELLOW}→ {text}{Style.RESET_ALL}")
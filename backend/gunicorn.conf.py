@@ -0,0 +1,87 @@
+import math
+import multiprocessing
+import os
+
+# ===================================
+# GUNICORN (PRODUÇÃO)
+# ===================================
+# Uso: gunicorn -c gunicorn.conf.py wsgi:app
+#
+# Workers pré-fork com threads (gthread). O app é importado uma vez no
+# master (preload_app) e os workers herdam a memória por copy-on-write.
+# Cada worker abre o próprio pool de conexões depois do fork e aquece
+# conexões e caches antes de começar a atender.
+#
+# Reload sem derrubar conexões:
+#   kill -HUP <master>   recria os workers (config e .env relidos; com
+#                        preload_app o código novo exige o passo abaixo)
+#   kill -USR2 <master>  sobe um master novo com o código atualizado; depois
+#                        kill -TERM <master antigo> encerra os workers antigos
+#                        após terminarem as requisições em andamento
+#
+# Métricas e estatísticas são por worker: /metrics, /admin/cache e
+# /admin/pool mostram só o processo que atendeu a requisição, e cada coleta
+# cai em um worker qualquer. Para números do servidor inteiro, colete de
+# cada worker (ex.: um bind por worker atrás do balanceador) ou some no
+# Prometheus.
+
+cores = multiprocessing.cpu_count()
+
+bind = os.getenv('GUNICORN_BIND', '0.0.0.0:5000')
+workers = int(os.getenv('GUNICORN_WORKERS', cores * 2 + 1))
+worker_class = 'gthread'
+preload_app = True
+
+# Threads: as requisições passam a maior parte do tempo esperando o banco,
+# então o servidor mantém umas 8 por núcleo em andamento, divididas entre os
+# workers (4 por worker com o padrão de 2×núcleos+1). Nunca mais threads que
+# conexões do pool (DB_POOL_SIZE + DB_MAX_OVERFLOW, ver app/pool.py), para
+# nenhuma thread ficar parada esperando conexão.
+db_connections = int(os.getenv('DB_POOL_SIZE', 10)) + int(os.getenv('DB_MAX_OVERFLOW', 20))
+threads = min(int(os.getenv('GUNICORN_THREADS', max(2, math.ceil(8 * cores / workers)))), db_connections)
+
+# Cada worker tem o próprio pool de processos do bcrypt (hashing.py), então
+# o total no servidor é workers × PASSWORD_HASH_WORKERS. Aqui ele é
+# núcleos / workers: com o padrão de 2×núcleos+1 workers isso dá 1 por
+# worker, o mínimo possível (o total já passa do número de núcleos, e mais
+# processos só disputariam CPU). Com menos workers (GUNICORN_WORKERS) cada
+# um recebe mais. PASSWORD_HASH_WORKERS definido no ambiente continua valendo.
+os.environ.setdefault('PASSWORD_HASH_WORKERS', str(max(1, cores // workers)))
+
+# Encerramento gracioso: requisições em andamento têm até graceful_timeout
+timeout = int(os.getenv('GUNICORN_TIMEOUT', 30))
+graceful_timeout = int(os.getenv('GUNICORN_GRACEFUL_TIMEOUT', 30))
+keepalive = 5
+
+# Recicla workers aos poucos para conter vazamentos de memória
+max_requests = int(os.getenv('GUNICORN_MAX_REQUESTS', 5000))
+max_requests_jitter = max_requests // 10
+
+accesslog = os.getenv('GUNICORN_ACCESS_LOG', '-')
+errorlog = '-'
+
+
+def _app():
+    from wsgi import app
+    return app
+
+
+def post_fork(server, worker):
+    # Conexões abertas no master (durante o preload) não podem ser
+    # compartilhadas entre processos: o worker descarta as herdadas sem
+    # fechá-las (o socket ainda pertence ao master) e abre as próprias.
+    from app import db
+    with _app().app_context():
+        # Principal e réplica (SQLALCHEMY_REPLICA_URI), se houver
+        for engine in db.engines.values():
+            engine.dispose(close=False)
+
+
+def post_worker_init(worker):
+    # Roda no worker antes de aceitar requisições: uma conexão por thread já
+    # aberta no pool e o catálogo no cache. Só então o /readyz responde 200.
+    from app import health
+    if health.warm_up(_app(), connections=worker.cfg.threads):
+        worker.log.info('Worker aquecido')
+    else:
+        worker.log.warning('Aquecimento falhou; /readyz fica em 503: %s', health.state.warm_up_error)
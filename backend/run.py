@@ -1,4 +1,6 @@
-from app import create_app
+import threading
+
+from app import create_app, health
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -6,4 +8,6 @@ load_dotenv()
 app = create_app()
 
 if __name__ == '__main__':
+    # Sem gunicorn: aquece em segundo plano; /readyz responde 503 até terminar
+    threading.Thread(target=health.warm_up, args=(app,), daemon=True).start()
     app.run(debug=True)  # Porta 5000 é o padrão
\ No newline at end of file
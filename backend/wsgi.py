@@ -0,0 +1,9 @@
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from app import create_app  # noqa: E402 (o .env precisa ser lido antes do create_app)
+
+# Ponto de entrada para servidores WSGI de produção:
+#   gunicorn -c gunicorn.conf.py wsgi:app
+app = create_app()
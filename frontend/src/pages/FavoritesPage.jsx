@@ -4,12 +4,14 @@ import { Button } from '@/components/ui/button'
 import { Badge } from '@/components/ui/badge'
 import { Heart } from 'lucide-react'
 import { useNavigate } from 'react-router-dom'
-import { favoriteService, productService } from '@/services/api'
+import { favoriteService, mediaUrl, mediaSrcSet } from '@/services/api'
 
 export default function FavoritesPage({ user }) {
   const navigate = useNavigate()
   const [favorites, setFavorites] = useState([])
+  const [nextCursor, setNextCursor] = useState(null)
   const [loading, setLoading] = useState(true)
+  const [loadingMore, setLoadingMore] = useState(false)
   const [error, setError] = useState('')
 
   useEffect(() => {
@@ -21,20 +23,13 @@ export default function FavoritesPage({ user }) {
     loadFavorites()
   }, [user, navigate])
 
+  // GET /favorites já devolve os produtos (JOIN no backend), uma página por vez
   const loadFavorites = async () => {
     try {
       setLoading(true)
-      const [favoritesResponse, productsResponse] = await Promise.all([
-        favoriteService.getAll(),
-        productService.getAll()
-      ])
-
-      const favoriteProductIds = favoritesResponse.favorites.map(f => f.product_id)
-      const favoriteProducts = productsResponse.products.filter(p => 
-        favoriteProductIds.includes(p.id)
-      )
-
-      setFavorites(favoriteProducts)
+      const page = await favoriteService.getPage()
+      setFavorites(page.favorites || [])
+      setNextCursor(page.next_cursor)
       setError('')
     } catch (err) {
       setError('Erro ao carregar favoritos')
@@ -44,6 +39,19 @@ export default function FavoritesPage({ user }) {
     }
   }
 
+  const loadMore = async () => {
+    try {
+      setLoadingMore(true)
+      const page = await favoriteService.getPage(nextCursor)
+      setFavorites(prev => [...prev, ...(page.favorites || [])])
+      setNextCursor(page.next_cursor)
+    } catch (err) {
+      console.error('Erro ao carregar mais favoritos:', err)
+    } finally {
+      setLoadingMore(false)
+    }
+  }
+
   const removeFavorite = async (productId) => {
     try {
       await favoriteService.remove(productId)
@@ -108,7 +116,10 @@ export default function FavoritesPage({ user }) {
                 <div className="flex justify-between items-start">
                   {product.image_url ? (
                     <img 
-                      src={product.image_url} 
+                      src={mediaUrl(product.image_url)} 
+                      srcSet={mediaSrcSet(product.srcset)}
+                      sizes="(min-width: 1024px) 33vw, (min-width: 768px) 50vw, 100vw"
+                      loading="lazy"
                       alt={product.name}
                       className="w-full h-48 object-cover rounded-md mb-4"
                     />
@@ -148,6 +159,14 @@ export default function FavoritesPage({ user }) {
           ))}
         </div>
       )}
+
+      {nextCursor && (
+        <div className="flex justify-center mt-8">
+          <Button variant="outline" onClick={loadMore} disabled={loadingMore}>
+            {loadingMore ? 'Carregando...' : 'Carregar mais favoritos'}
+          </Button>
+        </div>
+      )}
     </div>
   )
 }
@@ -6,23 +6,42 @@ export default function ProductDetails({ user }) {
   const { id } = useParams();
   const [product, setProduct] = useState(null);
   const [reviews, setReviews] = useState([]);
+  const [nextCursor, setNextCursor] = useState(null);
+  const [summary, setSummary] = useState(null);
   const [comment, setComment] = useState("");
   const navigate = useNavigate();
 
   const loadProductAndReviews = async () => {
     try {
-      const productRes = await fetch(`http://localhost:5000/products/${id}`);
+      const productRes = await fetch(`http://localhost:5000/products/${id}`, { credentials: "include" });
       const productData = await productRes.json();
       setProduct(productData);
 
-      const reviewsRes = await fetch(`http://localhost:5000/products/${id}/reviews`);
-      const reviewsData = await reviewsRes.json();
-      setReviews(reviewsData);
+      await loadReviews();
     } catch (err) {
       console.error("Erro ao carregar produto e comentários:", err);
     }
   };
 
+  // Comentários paginados: a primeira página traz também o resumo das notas
+  const loadReviews = async (cursor = null) => {
+    const params = new URLSearchParams({ limit: 20 });
+    if (cursor) params.set("cursor", cursor);
+    const res = await fetch(`http://localhost:5000/products/${id}/reviews?${params}`, { credentials: "include" });
+    const data = await res.json();
+    setReviews(prev => (cursor ? [...prev, ...data.reviews] : data.reviews));
+    setNextCursor(data.next_cursor);
+    if (data.summary) setSummary(data.summary);
+  };
+
+  const handleLoadMore = async () => {
+    try {
+      await loadReviews(nextCursor);
+    } catch (err) {
+      console.error("Erro ao carregar mais comentários:", err);
+    }
+  };
+
   useEffect(() => {
     loadProductAndReviews();
   }, [id]);
@@ -38,6 +57,7 @@ export default function ProductDetails({ user }) {
     try {
       const res = await fetch(`http://localhost:5000/products/${id}/reviews`, {
         method: "POST",
+        credentials: "include",
         headers: { "Content-Type": "application/json" },
         body: JSON.stringify({ user_id: user?.id, comment }),
       });
@@ -64,6 +84,7 @@ export default function ProductDetails({ user }) {
     try {
       const res = await fetch(`http://localhost:5000/products/${id}/reviews/${reviewId}`, {
         method: "DELETE",
+        credentials: "include",
         headers: {
           "Content-Type": "application/json",
           "Authorization": `Bearer ${localStorage.getItem("token")}`
@@ -89,7 +110,7 @@ export default function ProductDetails({ user }) {
 
     const loadAverage = async () => {
       try {
-        const res = await fetch(`http://localhost:5000/products/${productId}/rating`);
+        const res = await fetch(`http://localhost:5000/products/${productId}/rating`, { credentials: "include" });
         const data = await res.json();
         setAverage(data.average);
       } catch (err) {
@@ -112,6 +133,7 @@ export default function ProductDetails({ user }) {
       try {
         const res = await fetch(`http://localhost:5000/products/${productId}/rating`, {
           method: "POST",
+          credentials: "include",
           headers: {
             "Content-Type": "application/json",
             "Authorization": `Bearer ${token}`,
@@ -186,6 +208,22 @@ export default function ProductDetails({ user }) {
 
       <div className="mt-6">
         <h3 className="text-lg font-semibold mb-3">Comentários</h3>
+        {summary && summary.count > 0 && (
+          <div className="mb-4">
+            {[5, 4, 3, 2, 1].map((stars) => (
+              <div key={stars} className="flex items-center gap-2 text-sm">
+                <span className="w-8">{stars} ★</span>
+                <div className="flex-1 bg-gray-200 rounded h-2">
+                  <div
+                    className="bg-yellow-400 h-2 rounded"
+                    style={{ width: `${(summary.histogram[stars] / summary.count) * 100}%` }}
+                  />
+                </div>
+                <span className="w-8 text-right text-gray-500">{summary.histogram[stars]}</span>
+              </div>
+            ))}
+          </div>
+        )}
         {reviews.length === 0 ? (
           <p className="text-gray-500">Nenhum comentário ainda.</p>
         ) : (
@@ -207,6 +245,11 @@ export default function ProductDetails({ user }) {
             </div>
           ))
         )}
+        {nextCursor && (
+          <Button onClick={handleLoadMore} className="mt-4">
+            Carregar mais comentários
+          </Button>
+        )}
       </div>
     </div>
   );
@@ -4,40 +4,53 @@ import { Button } from '@/components/ui/button'
 import { Badge } from '@/components/ui/badge'
 import { Heart, Mail, Phone } from 'lucide-react'
 import { useNavigate } from 'react-router-dom'
-import { productService, favoriteService } from '@/services/api'
+import { productService, favoriteService, mediaUrl, mediaSrcSet } from '@/services/api'
+
+const PAGE_SIZE = 24
 
 export default function ProductsPage({ user }) {
   const [products, setProducts] = useState([])
+  const [nextCursor, setNextCursor] = useState(null)
   const [favorites, setFavorites] = useState([])
   const [filter, setFilter] = useState('all')
   const [loading, setLoading] = useState(true)
+  const [loadingMore, setLoadingMore] = useState(false)
   const [error, setError] = useState('')
   const navigate = useNavigate()
 
   useEffect(() => {
-    loadProducts()
     if (user) loadFavorites()
   }, [user])
 
+  // Cada filtro recomeça da primeira página; o filtro por tipo é feito no backend
+  useEffect(() => {
+    loadProducts()
+  }, [filter, user])
+
+  const fetchPage = async (cursor) => {
+    if (filter === 'favorites') {
+      if (!user) return { items: [], next_cursor: null }
+      const page = await favoriteService.getPage(cursor, PAGE_SIZE)
+      return { items: page.favorites || [], next_cursor: page.next_cursor }
+    }
+    const params = { include: 'rating', limit: PAGE_SIZE }
+    if (filter !== 'all') params.type = filter
+    if (cursor) params.cursor = cursor
+    const page = await productService.getPage(params)
+    return { items: page.products || [], next_cursor: page.next_cursor }
+  }
+
+  const withRatings = (items) => items.map((p) => ({
+    ...p,
+    average_rating: p.rating ? p.rating.average : null,
+  }))
+
   const loadProducts = async () => {
     try {
       setLoading(true)
-      const response = await productService.getAll()
-      const baseProducts = response.products || []
-
-      const productsWithRatings = await Promise.all(
-        baseProducts.map(async (p) => {
-          try {
-            const res = await fetch(`http://localhost:5000/products/${p.id}/rating`)
-            const data = await res.json()
-            return { ...p, average_rating: data.average }
-          } catch {
-            return { ...p, average_rating: null }
-          }
-        })
-      )
-
-      setProducts(productsWithRatings)
+      const page = await fetchPage(null)
+      setProducts(withRatings(page.items))
+      setNextCursor(page.next_cursor)
       setError('')
     } catch (err) {
       setError('Erro ao carregar produtos')
@@ -47,10 +60,22 @@ export default function ProductsPage({ user }) {
     }
   }
 
+  const loadMore = async () => {
+    try {
+      setLoadingMore(true)
+      const page = await fetchPage(nextCursor)
+      setProducts(prev => [...prev, ...withRatings(page.items)])
+      setNextCursor(page.next_cursor)
+    } catch (err) {
+      console.error('Erro ao carregar mais produtos:', err)
+    } finally {
+      setLoadingMore(false)
+    }
+  }
+
   const loadFavorites = async () => {
     try {
-      const response = await favoriteService.getAll()
-      const favoriteIds = response.favorites.map(f => f.id || f.product_id)
+      const favoriteIds = await favoriteService.getIds()
       setFavorites(favoriteIds)
     } catch (err) {
       console.error('Erro ao carregar favoritos:', err)
@@ -87,11 +112,10 @@ export default function ProductsPage({ user }) {
     return categories[type] || type
   }
 
-  const filteredProducts = (() => {
-    if (filter === 'all') return products
-    if (filter === 'favorites') return products.filter(p => favorites.includes(p.id))
-    return products.filter(p => p.type === filter)
-  })()
+  // Ao desfavoritar na aba de favoritos o card some sem recarregar a página
+  const filteredProducts = filter === 'favorites'
+    ? products.filter(p => favorites.includes(p.id))
+    : products
 
   if (loading) return <p className="text-center">Carregando produtos...</p>
   if (error) return <div className="bg-destructive/10 text-destructive px-4 py-2 rounded-md">{error}</div>
@@ -148,7 +172,14 @@ export default function ProductsPage({ user }) {
 
                 {/* Imagem */}
                 {product.image_url ? (
-                  <img src={product.image_url} alt={product.name} className="w-full h-48 object-cover rounded-md mb-4" />
+                  <img
+                    src={mediaUrl(product.image_url)}
+                    srcSet={mediaSrcSet(product.srcset)}
+                    sizes="(min-width: 1024px) 33vw, (min-width: 768px) 50vw, 100vw"
+                    loading="lazy"
+                    alt={product.name}
+                    className="w-full h-48 object-cover rounded-md mb-4"
+                  />
                 ) : (
                   <div className="w-full h-48 bg-muted rounded-md mb-4 flex items-center justify-center">
                     <span className="text-4xl">🏠</span>
@@ -188,6 +219,14 @@ export default function ProductsPage({ user }) {
           ))}
         </div>
       )}
+
+      {nextCursor && (
+        <div className="flex justify-center mt-8">
+          <Button variant="outline" onClick={loadMore} disabled={loadingMore}>
+            {loadingMore ? 'Carregando...' : 'Carregar mais produtos'}
+          </Button>
+        </div>
+      )}
     </div>
   )
 }
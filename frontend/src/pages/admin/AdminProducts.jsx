@@ -4,15 +4,18 @@ import { productService } from "../../services/api";
 
 export default function AdminProducts() {
   const [products, setProducts] = useState([]);
+  const [nextCursor, setNextCursor] = useState(null);
   const [form, setForm] = useState({ name: "", price: "", description: ""});
   const [loading, setLoading] = useState(false);
   const [editingId, setEditingId] = useState(null);
 
-  const loadProducts = async () => {
+  // Uma página por vez (keyset); "Carregar mais" segue o next_cursor
+  const loadProducts = async (cursor = null) => {
     setLoading(true);
     try {
-      const data = await productService.getAll();
-      setProducts(data.products || []);
+      const data = await productService.getPage(cursor ? { cursor } : {});
+      setProducts((prev) => (cursor ? [...prev, ...(data.products || [])] : data.products || []));
+      setNextCursor(data.next_cursor);
     } catch (err) {
       alert("Erro ao carregar produtos: " + err.message);
     } finally {
@@ -140,6 +143,16 @@ export default function AdminProducts() {
           ))}
         </ul>
       )}
+
+      {nextCursor && (
+        <button
+          onClick={() => loadProducts(nextCursor)}
+          disabled={loading}
+          className="bg-gray-200 px-3 py-1 rounded"
+        >
+          Carregar mais
+        </button>
+      )}
     </div>
   );
 }
@@ -3,6 +3,20 @@
 // ===============================
 const API_BASE_URL = import.meta.env.VITE_API_URL || 'http://localhost:5000';
 
+// -------------------------------
+// 🖼️ Helper: URLs de imagens servidas pelo backend
+// -------------------------------
+// O backend devolve image_url e srcset relativos (/static/media/...) quando
+// MEDIA_BASE_URL não está configurado; aqui eles viram URLs da API
+const withApiBase = (url) => (url && url.startsWith('/') ? `${API_BASE_URL}${url}` : url);
+
+export const mediaUrl = (url) => withApiBase(url) || undefined;
+
+export const mediaSrcSet = (srcset) =>
+  srcset
+    ? srcset.split(',').map((entry) => withApiBase(entry.trim())).join(', ')
+    : undefined;
+
 // -------------------------------
 // 🔐 Helper: obter token JWT do localStorage
 // -------------------------------
@@ -23,7 +37,9 @@ const fetchWithAuth = async (url, options = {}) => {
     headers['Authorization'] = `Bearer ${token}`;
   }
 
-  const response = await fetch(`${API_BASE_URL}${url}`, { ...options, headers });
+  // credentials: o cookie de "ler do banco principal" mantém as leituras
+  // consistentes logo depois de uma escrita (réplica de leitura no backend)
+  const response = await fetch(`${API_BASE_URL}${url}`, { ...options, headers, credentials: 'include' });
 
   if (!response.ok) {
     const error = await response.json().catch(() => ({ error: 'Erro desconhecido' }));
@@ -64,8 +80,12 @@ export const authService = {
 // 🛒 Produtos
 // ===============================
 export const productService = {
-  // Público
-  getAll: () => fetchWithAuth('/products'),
+  // Público, uma página por vez: passe o next_cursor da resposta como cursor
+  // para buscar a seguinte ("carregar mais")
+  getPage: (params = {}) => {
+    const query = new URLSearchParams(params).toString();
+    return fetchWithAuth(`/products${query ? `?${query}` : ''}`);
+  },
 
   // Admin
   create: (productData) =>
@@ -90,7 +110,25 @@ export const productService = {
 // ❤️ Favoritos
 // ===============================
 export const favoriteService = {
-  getAll: async () => fetchWithAuth("/favorites", "GET"),
+  // Uma página por vez, como productService.getPage
+  getPage: async (cursor = null, limit = 50) => {
+    const params = new URLSearchParams({ limit });
+    if (cursor) params.set('cursor', cursor);
+    return fetchWithAuth(`/favorites?${params}`);
+  },
+
+  // Só os ids dos produtos favoritos (com ETag: o navegador revalida e recebe 304)
+  getIds: async () => {
+    const { ids } = await fetchWithAuth('/favorites/ids');
+    return ids || [];
+  },
+
+  // Várias alterações em uma única transação: { add: [ids], remove: [ids] }
+  batch: async ({ add = [], remove = [] }) =>
+    fetchWithAuth('/favorites/batch', {
+      method: 'POST',
+      body: JSON.stringify({ add, remove }),
+    }),
 
   add: async (productId) =>
     fetchWithAuth('/favorites', {